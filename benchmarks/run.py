@@ -0,0 +1,220 @@
+"""Headless benchmarks for the dashboard's load, aggregate and figure hot paths.
+
+Runs outside Streamlit against synthetic cohorts generated from the bundled CSV
+and prints one JSON document with the timing of every stage:
+
+    python -m benchmarks.run                       # 1x, 100x, 1000x
+    python -m benchmarks.run --scales 1 10 -o run.json
+    python -m benchmarks.run --compare baseline.json
+
+With --compare, stages that got slower than --tolerance (default 20%) are
+listed and the exit code is 1, so runs can gate regressions.
+"""
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from dashboard import data, plots
+from dashboard.aggregates import CUBE_DIMENSIONS, AggregateCube
+from dashboard.data import DATA_PATH, prepare_frame, read_dataset
+from dashboard.synthetic import CohortModel, write_cohort
+
+DEFAULT_SCALES = [1, 100, 1000]
+
+# (name, plot function, source) for every dashboard figure.
+FIGURES = [
+    ('plot_cgpa_vs_gender', plots.plot_cgpa_vs_gender, 'data'),
+    ('plot_cgpa_heatmap', plots.plot_cgpa_heatmap, 'cube'),
+    ('plot_cgpa_by_income_scholarship', plots.plot_cgpa_by_income_scholarship, 'cube'),
+    ('plot_cgpa_vs_social_media', plots.plot_cgpa_vs_social_media, 'data'),
+    ('plot_cgpa_vs_attendance', plots.plot_cgpa_vs_attendance, 'data'),
+    ('plot_pc_vs_learning_mode', plots.plot_pc_vs_learning_mode, 'cube'),
+    ('plot_cgpa_by_probation_consultancy', plots.plot_cgpa_by_probation_consultancy, 'data'),
+    ('plot_skill_dev_by_semester', plots.plot_skill_dev_by_semester, 'cube'),
+    ('plot_english_probation_heatmap', plots.plot_english_probation_heatmap, 'cube'),
+]
+
+
+def scaled_csv(source, scale, directory, seed=0):
+    """Write a synthetic cohort `scale` times the size of `source` (scale 1 is the source itself)."""
+    raw = pd.read_csv(source)
+    rows = len(raw) * scale
+    target = Path(directory) / f"cohort_x{scale}.csv"
+    if scale > 1:
+        write_cohort(CohortModel.fit(raw), rows, target, seed=seed)
+    else:
+        raw.to_csv(target, index=False)
+    return target, rows
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; return (last result, list of durations)."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return result, durations
+
+
+def record(results, scale, rows, stage, durations, **extra):
+    results.append({
+        'scale': scale,
+        'rows': rows,
+        'stage': stage,
+        'min_s': min(durations),
+        'median_s': statistics.median(durations),
+        'repeat': len(durations),
+        **extra,
+    })
+
+
+def bench_scale(path, scale, rows, repeat):
+    results = []
+
+    raw, durations = timed(lambda: read_dataset(path), repeat)
+    record(results, scale, rows, 'parse', durations)
+
+    df, durations = timed(lambda: prepare_frame(raw.copy()), repeat)
+    record(results, scale, rows, 'dtype_cast', durations)
+
+    for dims in CUBE_DIMENSIONS:
+        _, durations = timed(lambda: AggregateCube.build(df, dimensions=[dims]), repeat)
+        record(results, scale, rows, f"groupby:{'+'.join(dims)}", durations)
+    cube, durations = timed(lambda: AggregateCube.build(df), repeat)
+    record(results, scale, rows, 'cube_build', durations)
+
+    for name, plot_fn, source in FIGURES:
+        arg = df if source == 'data' else cube
+        fig, durations = timed(lambda: plot_fn(arg), repeat)
+        record(results, scale, rows, f"figure:{name}", durations)
+        payload, durations = timed(lambda: fig.to_json(), repeat)
+        record(results, scale, rows, f"to_json:{name}", durations, payload_bytes=len(payload))
+    return results
+
+
+def _fresh_snapshot_dir(directory):
+    data.SNAPSHOT_DIR = Path(directory) / 'snapshots'
+    shutil.rmtree(data.SNAPSHOT_DIR, ignore_errors=True)
+    data.SNAPSHOT_DIR.mkdir(parents=True)
+
+
+def bench_load_path(path, scale, rows, repeat, directory):
+    """The load path the app uses: streamed CSV ingest (cold and append-only)
+    and memory-mapped snapshot reads. Skipped when pyarrow is missing."""
+    results = []
+    if data.feather is None:
+        return results
+    saved_dir = data.SNAPSHOT_DIR
+    try:
+        fingerprint = data.file_fingerprint(path)
+
+        def cold():
+            _fresh_snapshot_dir(directory)
+            return data.ingest_snapshot(path, fingerprint)
+        _, durations = timed(cold, repeat)
+        record(results, scale, rows, 'ingest:cold', durations)
+
+        target = data.snapshot_path(path, fingerprint)
+
+        _, durations = timed(lambda: data.read_snapshot(target), repeat)
+        record(results, scale, rows, 'load:snapshot', durations)
+        _, durations = timed(lambda: data.read_cube_snapshot(target), repeat)
+        record(results, scale, rows, 'load:cube_snapshot', durations)
+        _, durations = timed(lambda: data.load_frame(path), repeat)
+        record(results, scale, rows, 'load:frame', durations)
+
+        # The file grows by its last tenth: only those rows are parsed.
+        content = Path(path).read_bytes()
+        cut = content.index(b'\n', len(content) * 9 // 10) + 1
+        grown = Path(directory) / f"{Path(path).stem}_grown.csv"
+        durations = []
+        for _ in range(repeat):
+            _fresh_snapshot_dir(directory)
+            grown.write_bytes(content[:cut])
+            data.ingest_snapshot(grown, data.file_fingerprint(grown))
+            with open(grown, 'ab') as fh:
+                fh.write(content[cut:])
+            grown_fingerprint = data.file_fingerprint(grown)
+            start = time.perf_counter()
+            data.ingest_snapshot(grown, grown_fingerprint)
+            durations.append(time.perf_counter() - start)
+        record(results, scale, rows, 'ingest:append', durations, appended_bytes=len(content) - cut)
+        grown.unlink()
+    finally:
+        shutil.rmtree(Path(directory) / 'snapshots', ignore_errors=True)
+        data.SNAPSHOT_DIR = saved_dir
+    return results
+
+
+def compare(current, baseline, tolerance):
+    """Stages whose median time grew by more than `tolerance` versus a baseline run."""
+    base = {(r['scale'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        old = base.get((r['scale'], r['stage']))
+        if old and old['median_s'] > 0 and r['median_s'] > old['median_s'] * (1 + tolerance):
+            regressions.append({
+                'scale': r['scale'], 'stage': r['stage'],
+                'baseline_s': old['median_s'], 'current_s': r['median_s'],
+                'ratio': r['median_s'] / old['median_s'],
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=str(DATA_PATH), help="CSV to scale from")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help="write JSON here instead of stdout")
+    parser.add_argument('--compare', help="baseline JSON from a previous run")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    run = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plotly': plotly.__version__,
+            'machine': platform.machine(),
+            'source': args.source,
+        },
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            path, rows = scaled_csv(args.source, scale, tmp)
+            run['results'].extend(bench_load_path(path, scale, rows, args.repeat, tmp))
+            run['results'].extend(bench_scale(path, scale, rows, args.repeat))
+            path.unlink()
+
+    status = 0
+    if args.compare:
+        run['regressions'] = compare(run, json.loads(Path(args.compare).read_text()), args.tolerance)
+        status = 1 if run['regressions'] else 0
+
+    text = json.dumps(run, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Shared data access and analysis helpers for the Academic Performance Dashboard."""
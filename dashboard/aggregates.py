@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.instrument import instrumented
+
+# =========================================================
+# Cube Definition
+# =========================================================
+# Every group-by used by the dashboard pages. Smaller key sets are answered
+# by rolling up a larger combination that contains them, so e.g. the
+# probation rate by English proficiency comes from the English x Probation cell.
+CUBE_DIMENSIONS = [
+    ('Gender',),
+    ('Admission_Year', 'Age_Group'),
+    ('Income_Group', 'Meritorious_Scholarship'),
+    ('Daily_Study_Hours',),
+    ('Daily_Social_Media_Hours',),
+    ('Learning_Mode', 'Has_PC'),
+    ('Attends_Consultancy',),
+    ('English_Proficiency', 'Fell_Probation'),
+    ('Semester',),
+]
+
+CUBE_METRICS = [
+    'Current_CGPA', 'Attendance_Pct', 'Daily_Skill_Dev_Hours',
+    'Fell_Probation', 'Got_Suspension', 'Meritorious_Scholarship', 'Attends_Consultancy',
+]
+
+# Metric pairs whose cross-product sum is stored so correlations can be
+# answered from the cube as well.
+CUBE_PAIRS = [('Attendance_Pct', 'Current_CGPA')]
+
+
+def _pair_name(x, y):
+    return f"{x}*{y}"
+
+
+class AggregateCube:
+    """Mergeable per-group statistics (count, sum, sum of squares, min, max).
+
+    Built once per dataset version with one scan per dimension combination.
+    Means, standard deviations, rates and correlations are then derived from
+    the stored sums in time proportional to the number of groups.
+    """
+
+    def __init__(self, tables, metrics, pairs):
+        self.tables = tables
+        self.metrics = list(metrics)
+        self.pairs = list(pairs)
+
+    @classmethod
+    def build(cls, df, dimensions=CUBE_DIMENSIONS, metrics=CUBE_METRICS, pairs=CUBE_PAIRS):
+        metrics = [m for m in metrics if m in df.columns]
+        pairs = [(x, y) for x, y in pairs if x in metrics and y in metrics]
+        values = cls._value_frame(df, metrics, pairs)
+
+        tables = {(): cls._summarize(values, metrics, pairs, keys=None)}
+        for dims in dimensions:
+            if all(d in df.columns for d in dims):
+                keys = [df[d] for d in dims]
+                tables[tuple(dims)] = cls._summarize(values, metrics, pairs, keys=keys)
+        return cls(tables, metrics, pairs)
+
+    @classmethod
+    def combine(cls, cubes):
+        """Merge cubes built over disjoint sets of rows, e.g. chunks of one file.
+
+        Group keys are matched by value, so chunks may carry different
+        category lists; use with_level_dtypes() to restore the final dtypes.
+        """
+        first = cubes[0]
+        tables = {}
+        for dims in first.tables:
+            table = pd.concat([cube.tables[dims] for cube in cubes])
+            if dims:
+                tables[dims] = cls.merge_groups(table, list(dims))
+            else:
+                table = table.set_axis(pd.Index(np.zeros(len(table), dtype=np.int8), name='_all'), axis=0)
+                tables[dims] = cls.merge_groups(table, '_all').set_axis(pd.Index([()]), axis=0)
+        return cls(tables, first.metrics, first.pairs)
+
+    def with_level_dtypes(self, dtypes):
+        """Cast group-key levels to the given column dtypes and re-sort the groups."""
+        tables = {}
+        for dims, table in self.tables.items():
+            if dims:
+                keys = table.index.to_frame(index=False)
+                for d in dims:
+                    keys[d] = keys[d].astype(dtypes[d])
+                table = table.set_axis(pd.MultiIndex.from_frame(keys) if len(dims) > 1
+                                       else pd.Index(keys[dims[0]]), axis=0).sort_index()
+            tables[dims] = table
+        return AggregateCube(tables, self.metrics, self.pairs)
+
+    @staticmethod
+    def _value_frame(df, metrics, pairs):
+        values = df[metrics].astype('float64')
+        for m in metrics:
+            values[f"{m}^2"] = values[m] ** 2
+        for x, y in pairs:
+            values[_pair_name(x, y)] = values[x] * values[y]
+        return values
+
+    @staticmethod
+    def _summarize(values, metrics, pairs, keys):
+        """One pass producing a (metric, stat) column table per group."""
+        squares = [f"{m}^2" for m in metrics]
+        products = [_pair_name(x, y) for x, y in pairs]
+        overall = keys is None
+        if overall:
+            keys = [np.zeros(len(values), dtype=np.int8)]
+        grouped = values.groupby(keys, observed=True, sort=True)
+        parts = {
+            'rows': grouped.size(),
+            'count': grouped[metrics].count(),
+            'sum': grouped[metrics + squares + products].sum(),
+            'min': grouped[metrics].min(),
+            'max': grouped[metrics].max(),
+        }
+        index = pd.Index([()] * len(parts['rows'])) if overall else parts['rows'].index
+
+        columns = {('_rows', 'count'): np.asarray(parts['rows'])}
+        for m in metrics:
+            columns[(m, 'count')] = parts['count'][m].to_numpy()
+            columns[(m, 'sum')] = parts['sum'][m].to_numpy()
+            columns[(m, 'sum_sq')] = parts['sum'][f"{m}^2"].to_numpy()
+            columns[(m, 'min')] = parts['min'][m].to_numpy()
+            columns[(m, 'max')] = parts['max'][m].to_numpy()
+        for name in products:
+            columns[(name, 'sum')] = parts['sum'][name].to_numpy()
+        return pd.DataFrame(columns, index=index)
+
+    @property
+    def nbytes(self):
+        """Memory held by the stored tables."""
+        return sum(int(t.memory_usage(deep=True).sum()) for t in self.tables.values())
+
+    # -----------------------------------------------------
+    # Lookups
+    # -----------------------------------------------------
+    def covers(self, by, metric):
+        """Whether stats(by, metric) can be answered from the stored tables."""
+        by = set(by)
+        return metric in self.metrics and any(by <= set(dims) for dims in self.tables)
+
+    def _table(self, by):
+        """Return the stored table for `by`, rolling up a superset if needed."""
+        by = tuple(by)
+        if by in self.tables:
+            return self.tables[by]
+        if not by:
+            raise KeyError("Overall table missing from cube")
+
+        candidates = [dims for dims in self.tables if set(by) <= set(dims)]
+        if not candidates:
+            raise KeyError(f"No cube dimensions cover group-by {by}")
+        source = self.tables[min(candidates, key=len)]
+        return self.merge_groups(source, list(by))
+
+    @staticmethod
+    def merge_groups(table, level):
+        """Combine per-group statistics over the given index level(s)."""
+        grouped = table.groupby(level=level, observed=True, sort=True)
+        stat = table.columns.get_level_values(1)
+        merged = grouped.sum()
+        for agg in ('min', 'max'):
+            cols = table.columns[stat == agg]
+            merged[cols] = getattr(grouped[cols], agg)()
+        return merged
+
+    @instrumented('aggregate')
+    def stats(self, by, metric):
+        """Per-group count/sum/sum_sq/min/max plus derived mean and std."""
+        table = self._table(by)[metric].copy()
+        n = table['count']
+        table['mean'] = table['sum'] / n
+        var = (table['sum_sq'] - table['sum'] ** 2 / n) / (n - 1)
+        table['std'] = np.sqrt(var.clip(lower=0)).where(n > 1)
+        return table
+
+    def mean(self, by, metric):
+        return self.stats(by, metric)['mean']
+
+    def std(self, by, metric):
+        return self.stats(by, metric)['std']
+
+    @instrumented('aggregate')
+    def count(self, by=()):
+        """Number of rows per group."""
+        return self._table(by)[('_rows', 'count')].rename('count')
+
+    def rate(self, by, flag):
+        """Share of rows where a boolean flag is True, per group."""
+        return self.mean(by, flag)
+
+    @instrumented('aggregate')
+    def corr(self, x, y, by=()):
+        """Pearson correlation between two metrics from stored cross-products.
+
+        Only pairs listed in CUBE_PAIRS are available.
+        """
+        if (x, y) not in self.pairs:
+            x, y = y, x
+        table = self._table(by)
+        n = table[(x, 'count')]
+        sx, sy = table[(x, 'sum')], table[(y, 'sum')]
+        sxx, syy = table[(x, 'sum_sq')], table[(y, 'sum_sq')]
+        sxy = table[(_pair_name(x, y), 'sum')]
+        cov = sxy - sx * sy / n
+        return cov / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n))
+
+    def overall(self, metric):
+        """Whole-dataset statistics for one metric as a Series."""
+        return self.stats((), metric).iloc[0]
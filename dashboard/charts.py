@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# =========================================================
+# Rendering Thresholds
+# =========================================================
+# Above this many rows, box plots are sent as precomputed quartiles and the
+# attendance scatter is sent as a binned density, so the figure payload no
+# longer grows with the number of students.
+DOWNSAMPLE_THRESHOLD = int(os.environ.get("DOWNSAMPLE_THRESHOLD", 20_000))
+DENSITY_BINS = (50, 40)
+
+
+# =========================================================
+# Box Plots
+# =========================================================
+def box_stats(data, x, y, color=None):
+    """Quartiles, mean and Tukey whisker ends per (x, color) group.
+
+    Whiskers follow Plotly's convention: the most extreme values that lie
+    within 1.5 IQR of the box.
+    """
+    keys = [x] + ([color] if color and color != x else [])
+    grouped = data.groupby(keys, observed=True, sort=True)[y]
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats = pd.DataFrame({
+        'q1': quartiles[0.25],
+        'median': quartiles[0.5],
+        'q3': quartiles[0.75],
+        'mean': grouped.mean(),
+        'count': grouped.count(),
+    })
+
+    iqr = stats['q3'] - stats['q1']
+    low = (stats['q1'] - 1.5 * iqr).to_numpy()
+    high = (stats['q3'] + 1.5 * iqr).to_numpy()
+    codes = grouped.ngroup().to_numpy()
+    valid = codes >= 0
+    values = data[y].to_numpy(dtype='float64')[valid]
+    codes = codes[valid]
+    inside = (values >= low[codes]) & (values <= high[codes])
+    fences = pd.DataFrame({'value': values[inside], 'group': codes[inside]}).groupby('group')['value']
+    stats['lowerfence'] = fences.min().reindex(range(len(stats))).to_numpy()
+    stats['upperfence'] = fences.max().reindex(range(len(stats))).to_numpy()
+    return stats.reset_index()
+
+
+def _summary_box_figure(data, x, y, color, color_discrete_map, category_orders):
+    stats = box_stats(data, x, y, color)
+    fig = go.Figure()
+    palette = px.colors.qualitative.Plotly
+    series_key = color or x
+    series_values = category_orders.get(series_key) or list(pd.unique(stats[series_key]))
+    for i, value in enumerate(series_values):
+        part = stats[stats[series_key] == value]
+        if part.empty:
+            continue
+        fig.add_trace(go.Box(
+            x=part[x].astype(str), name=str(value),
+            q1=part['q1'], median=part['median'], q3=part['q3'], mean=part['mean'],
+            lowerfence=part['lowerfence'], upperfence=part['upperfence'],
+            marker_color=color_discrete_map.get(value, palette[i % len(palette)]),
+            offsetgroup=str(value) if color and color != x else None,
+        ))
+    if color and color != x:
+        fig.update_layout(boxmode='group')
+    return fig
+
+
+def box_plot(data, x, y, color=None, threshold=None, title=None, labels=None,
+             height=None, range_y=None, color_discrete_map=None, category_orders=None):
+    """px.box for small frames, a quartile-summary box plot above the threshold."""
+    threshold = DOWNSAMPLE_THRESHOLD if threshold is None else threshold
+    labels = labels or {}
+    color_discrete_map = color_discrete_map or {}
+    category_orders = category_orders or {}
+    if len(data) <= threshold:
+        return px.box(
+            data, x=x, y=y, color=color, title=title, labels=labels, height=height,
+            range_y=range_y, color_discrete_map=color_discrete_map,
+            category_orders=category_orders
+        )
+
+    fig = _summary_box_figure(data, x, y, color, color_discrete_map, category_orders)
+    fig.update_layout(
+        title=title, height=height,
+        xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y),
+        legend_title_text=labels.get(color, color) if color else None
+    )
+    if range_y:
+        fig.update_yaxes(range=range_y)
+    if x in category_orders:
+        fig.update_xaxes(categoryorder='array', categoryarray=[str(v) for v in category_orders[x]])
+    return fig
+
+
+# =========================================================
+# Scatter Plots
+# =========================================================
+def ols_fit(x, y):
+    """Closed-form least-squares line: returns (slope, intercept, r_squared)."""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    dx, dy = x - x.mean(), y - y.mean()
+    sxx, syy, sxy = dx @ dx, dy @ dy, dx @ dy
+    slope = sxy / sxx
+    intercept = y.mean() - slope * x.mean()
+    r_squared = sxy ** 2 / (sxx * syy)
+    return slope, intercept, r_squared
+
+
+def _trend_trace(data, x, y, x_range):
+    slope, intercept, r_squared = ols_fit(data[x], data[y])
+    line_x = np.array(x_range if x_range else [data[x].min(), data[x].max()], dtype='float64')
+    return go.Scatter(
+        x=line_x, y=intercept + slope * line_x, mode='lines', name='OLS trendline',
+        line=dict(color='#EF553B'),
+        hovertemplate=(f"<b>OLS trendline</b><br>{y} = {slope:.4f} * {x} + {intercept:.4f}"
+                       f"<br>R<sup>2</sup>={r_squared:.4f}<extra></extra>")
+    )
+
+
+def scatter_with_trend(data, x, y, threshold=None, title=None, height=None,
+                       range_x=None, range_y=None, bins=DENSITY_BINS):
+    """Scatter with an OLS trendline, switching to a density heatmap above the threshold.
+
+    The trendline is always fitted on every row in closed form, so both modes
+    show the exact regression line.
+    """
+    threshold = DOWNSAMPLE_THRESHOLD if threshold is None else threshold
+    if len(data) <= threshold:
+        fig = px.scatter(data, x=x, y=y, title=title, height=height, range_x=range_x, range_y=range_y)
+    else:
+        values_x = data[x].to_numpy(dtype='float64')
+        values_y = data[y].to_numpy(dtype='float64')
+        hist_range = [
+            range_x or [np.nanmin(values_x), np.nanmax(values_x)],
+            range_y or [np.nanmin(values_y), np.nanmax(values_y)],
+        ]
+        counts, x_edges, y_edges = np.histogram2d(values_x, values_y, bins=bins, range=hist_range)
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts > 0, counts, np.nan).T,
+            colorscale='Blues', colorbar=dict(title='Students'), hoverongaps=False,
+            hovertemplate=f"{x}=%{{x:.1f}}<br>{y}=%{{y:.2f}}<br>Students=%{{z:.0f}}<extra></extra>"
+        ))
+        fig.update_layout(title=title, height=height, xaxis_range=range_x, yaxis_range=range_y)
+    fig.add_trace(_trend_trace(data, x, y, range_x))
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+# =========================================================
+# Heatmap Cell Targets
+# =========================================================
+def add_cell_targets(fig, grid, hovertemplate):
+    """Overlay an invisible marker on every cell of a heatmap drawn from `grid`.
+
+    Plotly heatmaps cannot be selected, so these markers are what a click
+    on a cell selects; they carry the cell value for the hover label.
+    """
+    xs, ys = np.meshgrid(np.asarray(grid.columns, dtype=object), np.asarray(grid.index, dtype=object))
+    fig.add_trace(go.Scatter(
+        x=xs.ravel(), y=ys.ravel(), customdata=grid.to_numpy().ravel(),
+        mode='markers', marker=dict(size=36, opacity=0),
+        hovertemplate=hovertemplate, showlegend=False
+    ))
+    return fig
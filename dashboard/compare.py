@@ -0,0 +1,57 @@
+import pandas as pd
+import streamlit as st
+
+# Headline statistics compared across datasets, answered from each view's
+# aggregate cube: (row label, metric or pair, statistic, display format).
+COMPARE_ROWS = [
+    ('Students', None, 'rows', '{:,.0f}'),
+    ('Average CGPA', 'Current_CGPA', 'mean', '{:.2f}'),
+    ('CGPA standard deviation', 'Current_CGPA', 'std', '{:.2f}'),
+    ('Average attendance (%)', 'Attendance_Pct', 'mean', '{:.1f}'),
+    ('Attendance–CGPA correlation', ('Attendance_Pct', 'Current_CGPA'), 'corr', '{:.2f}'),
+    ('Daily skill development (hrs)', 'Daily_Skill_Dev_Hours', 'mean', '{:.2f}'),
+    ('Probation rate (%)', 'Fell_Probation', 'rate', '{:.1f}'),
+    ('Suspension rate (%)', 'Got_Suspension', 'rate', '{:.1f}'),
+    ('Scholarship rate (%)', 'Meritorious_Scholarship', 'rate', '{:.1f}'),
+    ('Consultancy attendance (%)', 'Attends_Consultancy', 'rate', '{:.1f}'),
+]
+
+
+def _statistic(cube, metric, stat):
+    if stat == 'rows':
+        return float(cube.count().iloc[0])
+    if stat == 'corr':
+        return float(cube.corr(*metric).iloc[0])
+    if stat == 'rate':
+        return float(cube.overall(metric)['mean']) * 100
+    return float(cube.overall(metric)[stat])
+
+
+def comparison_table(view_a, view_b):
+    """Headline statistics of two views side by side, with their difference (b - a)."""
+    rows = {
+        label: [_statistic(view.cube, metric, stat) for view in (view_a, view_b)]
+        for label, metric, stat, _ in COMPARE_ROWS
+    }
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=[view_a.label, view_b.label])
+    table['Difference'] = table[view_b.label] - table[view_a.label]
+    return table
+
+
+def render_comparison(view_a, view_b):
+    """Show the comparison table for the selected and the comparison dataset."""
+    st.subheader(f"📑 {view_a.label} vs. {view_b.label}")
+    if view_a.frame.empty or view_b.frame.empty:
+        st.info("No students match the current filters in one of the datasets.")
+        return
+    table = comparison_table(view_a, view_b)
+    formats = {label: fmt for label, _, _, fmt in COMPARE_ROWS}
+    shown = pd.DataFrame({
+        col: [formats[row].format(value) for row, value in table[col].items()]
+        for col in table.columns
+    }, index=table.index)
+    shown['Difference'] = [
+        ('+' if value > 0 else '') + formats[row].format(value) for row, value in table['Difference'].items()
+    ]
+    st.dataframe(shown, use_container_width=True)
+    st.caption("Both datasets use the same sidebar filters.")
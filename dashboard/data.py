@@ -0,0 +1,493 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from dashboard.aggregates import AggregateCube
+from dashboard.export import render_export
+from dashboard.filters import STATE_KEY as FILTER_STATE_KEY
+from dashboard.filters import GroupIndex, MaskIndex, filter_state_key, render_filter_sidebar
+from dashboard.instrument import timed
+from dashboard.registry import (
+    DATA_PATH, ROOT_DIR, render_dataset_selector, selected_comparison, selected_dataset,
+)
+from dashboard.schema import SchemaError, apply_schema
+from dashboard.store import get_frame_store
+
+try:
+    import pyarrow.feather as feather
+
+    from dashboard.ingest import stream_csv
+except ImportError:  # pragma: no cover - snapshots are an optional speed-up
+    feather = None
+
+# =========================================================
+# Snapshot Settings
+# =========================================================
+# Typed columnar snapshots of parsed CSVs live here, one per source file hash.
+SNAPSHOT_DIR = Path(os.environ.get("ACADEMIC_SNAPSHOT_DIR", ROOT_DIR / ".cache"))
+# Bump whenever the schema, the stored dtypes or the cube definition change.
+SNAPSHOT_VERSION = 3
+# Largest file parsed whole in memory when its snapshot cannot be written.
+# Larger files need a working snapshot directory.
+FALLBACK_MAX_BYTES = int(float(os.environ.get("ACADEMIC_FALLBACK_MAX_MB", 64)) * 1e6)
+
+# Hour columns shown as ordered categories of their observed values. They are
+# stored as small integers and ordered after loading, since the full set of
+# values is only known once every chunk has been read.
+ORDERED_HOUR_COLUMNS = ['Daily_Study_Hours', 'Daily_Social_Media_Hours']
+
+# One ingest at a time per process; concurrent sessions wait for the first.
+_INGEST_LOCK = threading.Lock()
+
+
+def read_dataset(path=None):
+    """Read the raw student table from disk."""
+    return pd.read_csv(path or DATA_PATH)
+
+
+def prepare_frame(df):
+    """Apply the compact schema and the ordered categoricals used by the pages."""
+    return order_categories(apply_schema(df))
+
+
+def order_categories(df):
+    """Order the hour columns by value and sort unordered category lists."""
+    for col in ORDERED_HOUR_COLUMNS:
+        df[col] = pd.Categorical(df[col], categories=sorted(df[col].unique()), ordered=True)
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered:
+            categories = sorted(dtype.categories)
+            if categories != list(dtype.categories):
+                df[col] = df[col].cat.reorder_categories(categories)
+    return df
+
+
+# =========================================================
+# Columnar Snapshots
+# =========================================================
+def file_fingerprint(path, chunk_size=1 << 20, limit=None):
+    """Return a short content hash identifying one version of a data file.
+
+    With `limit`, only the first `limit` bytes are hashed.
+    """
+    digest = hashlib.sha256()
+    remaining = float('inf') if limit is None else limit
+    with open(path, 'rb') as fh:
+        while remaining > 0:
+            chunk = fh.read(int(min(chunk_size, remaining)))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()[:16]
+
+
+def snapshot_path(path, fingerprint=None):
+    """Location of the Feather snapshot for a given source file version."""
+    path = Path(path)
+    fingerprint = fingerprint or file_fingerprint(path)
+    return SNAPSHOT_DIR / f"{path.stem}-{fingerprint}-v{SNAPSHOT_VERSION}.feather"
+
+
+def cube_snapshot_path(target):
+    """Location of the pickled aggregate cube stored next to a snapshot."""
+    return Path(target).with_suffix('.cube.pkl')
+
+
+def manifest_path(target):
+    """Location of the JSON manifest describing which bytes a snapshot covers."""
+    return Path(target).with_suffix('.json')
+
+
+def read_snapshot(target):
+    """Memory-map a Feather snapshot and convert it to a prepared DataFrame.
+
+    Uncompressed Arrow IPC can be memory-mapped, and the pandas metadata keeps
+    the compact dtypes and ordered categories intact. The memory saved by the
+    schema, when the manifest records it, is kept in df.attrs['memory_mb'].
+    """
+    table = feather.read_table(target, memory_map=True)
+    df = order_categories(table.to_pandas(split_blocks=True))
+    try:
+        df.attrs['memory_mb'] = json.loads(manifest_path(target).read_text()).get('memory_mb')
+    except (OSError, ValueError):
+        df.attrs.pop('memory_mb', None)
+    return df
+
+
+def read_cube_snapshot(target):
+    """The cube stored with a snapshot, or None if there is none."""
+    try:
+        with open(cube_snapshot_path(target), 'rb') as fh:
+            return pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _ends_line(path, offset):
+    with open(path, 'rb') as fh:
+        fh.seek(offset - 1)
+        return fh.read(1) == b'\n'
+
+
+def source_snapshots(path):
+    """(snapshot path, manifest) of every snapshot built from this same file."""
+    path = Path(path)
+    source = str(path.resolve())
+    # Exactly "{stem}-{16 hex digits}-v{version}", so "campus" never matches
+    # the snapshots of "campus-fall".
+    pattern = f"{glob.escape(path.stem)}-{'[0-9a-f]' * 16}-v{SNAPSHOT_VERSION}.json"
+    snapshots = []
+    for manifest_file in SNAPSHOT_DIR.glob(pattern):
+        try:
+            manifest = json.loads(manifest_file.read_text())
+        except (OSError, ValueError):
+            continue
+        if manifest.get('source') == source:
+            snapshots.append((manifest_file.with_suffix('.feather'), manifest))
+    return snapshots
+
+
+def find_append_base(path):
+    """Snapshot of an earlier version of `path` that the file only appends to.
+
+    A snapshot qualifies when it was built from this same file, the file is
+    longer than the bytes it was built from, those bytes still hash to its
+    fingerprint and they end on a line break. Returns (snapshot path,
+    manifest) for the longest match, or None.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    for target, manifest in sorted(source_snapshots(path), key=lambda c: c[1]['source_bytes'], reverse=True):
+        offset = manifest['source_bytes']
+        if not 0 < offset < size or not target.exists() or not cube_snapshot_path(target).exists():
+            continue
+        if _ends_line(path, offset) and file_fingerprint(path, limit=offset) == manifest['fingerprint']:
+            return target, manifest
+    return None
+
+
+def _write_atomic(target, write):
+    tmp = target.with_suffix('.tmp')
+    with open(tmp, 'wb') as fh:
+        write(fh)
+    os.replace(tmp, target)
+
+
+def _remove_snapshot(target):
+    for file in (target, cube_snapshot_path(target), manifest_path(target)):
+        try:
+            file.unlink(missing_ok=True)
+        except OSError:  # still memory-mapped elsewhere on some platforms
+            pass
+
+
+def ingest_snapshot(path, fingerprint, progress=None):
+    """Stream a CSV into its Feather snapshot and aggregate cube.
+
+    The cube is folded chunk by chunk during the same pass, then its group
+    keys are cast to the final frame dtypes and pickled next to the snapshot.
+    If the file only grew by appended rows since an earlier snapshot, that
+    snapshot is copied, only the new rows are parsed and their cube is merged
+    into the stored one. Once the new snapshot is complete, every other
+    snapshot of the same file is superseded and removed. Returns the
+    prepared frame read back from the snapshot.
+    """
+    path = Path(path)
+    target = snapshot_path(path, fingerprint)
+    with _INGEST_LOCK:
+        if target.exists():
+            return read_snapshot(target)
+        size = path.stat().st_size
+        base = find_append_base(path)
+        if base is None:
+            columns = list(pd.read_csv(path, nrows=0).columns)
+            cube, rows, memory = stream_csv(path, target, progress=progress)
+        else:
+            base_target, manifest = base
+            columns = manifest['columns']
+            delta, rows, memory = stream_csv(path, target, progress=progress, base=base_target,
+                                             offset=manifest['source_bytes'], columns=columns)
+            cube = AggregateCube.combine([read_cube_snapshot(base_target), delta])
+            base_memory = manifest.get('memory_mb')
+            memory = {key: base_memory[key] + memory[key] for key in memory} if base_memory else None
+
+        df = read_snapshot(target)
+        cube = cube.with_level_dtypes(df.dtypes)
+        _write_atomic(cube_snapshot_path(target),
+                      lambda fh: pickle.dump(cube, fh, protocol=pickle.HIGHEST_PROTOCOL))
+        if memory is not None:
+            memory = {key: round(value, 3) for key, value in memory.items()}
+        df.attrs['memory_mb'] = memory
+        manifest = {'source': str(path.resolve()), 'fingerprint': fingerprint, 'source_bytes': size,
+                    'rows': rows, 'columns': columns, 'memory_mb': memory}
+        _write_atomic(manifest_path(target), lambda fh: fh.write(json.dumps(manifest).encode()))
+        for old, _ in source_snapshots(path):
+            if old != target:
+                _remove_snapshot(old)
+        return df
+
+
+def ingest_or_parse(path, fingerprint, progress=None):
+    """ingest_snapshot(), or a whole-file parse when that fails on a small file.
+
+    Only files up to FALLBACK_MAX_BYTES fall back (e.g. when the snapshot
+    directory is not writable); for larger ones, and for schema errors, the
+    ingest error is raised rather than reading the file once more.
+    """
+    path = Path(path)
+    try:
+        return ingest_snapshot(path, fingerprint, progress=progress)
+    except SchemaError:
+        raise
+    except (OSError, ValueError):
+        if path.stat().st_size > FALLBACK_MAX_BYTES:
+            raise
+        return prepare_frame(read_dataset(path))
+
+
+def load_frame(path=None):
+    """Load the prepared frame, streaming the CSV into a snapshot on first use.
+
+    Parses the CSV in one go when pyarrow is unavailable; see
+    ingest_or_parse() for when a failed ingest does the same.
+    """
+    path = Path(path or DATA_PATH)
+    if feather is None:
+        return prepare_frame(read_dataset(path))
+
+    fingerprint = file_fingerprint(path)
+    target = snapshot_path(path, fingerprint)
+    if target.exists():
+        return read_snapshot(target)
+    return ingest_or_parse(path, fingerprint)
+
+
+# =========================================================
+# Cached Entry Points
+# =========================================================
+def dataset_version(path=None):
+    """Cheap version key for a data file: its size and modification time."""
+    try:
+        stat = os.stat(path or DATA_PATH)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class Dataset:
+    """One loaded dataset version: prepared frame, aggregate cube, filter and group indexes."""
+
+    def __init__(self, frame, cube, index, label, groups=None):
+        self.frame = frame
+        self.cube = cube
+        self.index = index
+        self.label = label
+        self.groups = groups
+
+    @property
+    def nbytes(self):
+        size = int(self.frame.memory_usage(deep=True).sum())
+        return size + sum(int(part.nbytes) for part in (self.cube, self.index, self.groups) if part is not None)
+
+
+def load_dataset(path=None):
+    """The Dataset for the current version of a file, loaded once per process.
+
+    Datasets live in the shared frame store, so concurrent sessions on the
+    same file use one copy. Numeric columns are read-only views of the
+    memory-mapped snapshot, and pandas copy-on-write keeps callers from
+    modifying the shared frame in place.
+    """
+    path = str(path or selected_dataset())
+    version = dataset_version(path)
+    try:
+        frame = _ingest_with_progress(path, version)
+    except Exception:
+        # Already reported; loading would only read the file again.
+        return Dataset(pd.DataFrame(), None, None, Path(path).stem)
+    store = get_frame_store()
+    key = ('dataset', path, version)
+    with timed('load:dataset', cached=store.get(key) is not None) as record:
+        dataset = store.get_or_load(key, lambda: _build_dataset(path, version, frame))
+        record['rows'] = len(dataset.frame)
+    return dataset
+
+
+def _build_dataset(path, version, frame=None):
+    with st.spinner("Loading dataset..."):
+        try:
+            return _assemble_dataset(path, version, frame)
+        except Exception as e:
+            st.error(f"🚨 Error loading dataset: {e}")
+            return Dataset(pd.DataFrame(), None, None, Path(path).stem)
+
+
+def _assemble_dataset(path, version, frame=None):
+    """Build a Dataset, from `frame` when the caller just ingested it."""
+    store = get_frame_store()
+    # Earlier versions of this file are superseded; free them right away.
+    store.discard(lambda key: key[1] == path and key[2] != version)
+    with timed('load:frame', ingested=frame is not None) as record:
+        if frame is None:
+            frame = load_frame(path)
+        record['rows'] = len(frame)
+    with timed('aggregate:cube', rows=len(frame)):
+        cube = read_cube_snapshot(snapshot_path(path, _dataset_fingerprint(path, version))) if feather else None
+        if cube is None:
+            cube = AggregateCube.build(frame)
+    with timed('aggregate:mask_index', rows=len(frame)):
+        index = MaskIndex(frame)
+    # Group row orders are built on the first drill-down into each chart.
+    return Dataset(frame, cube, index, Path(path).stem, GroupIndex(frame))
+
+
+def warm_dataset(path=None):
+    """Load a dataset into the frame store without drawing anything.
+
+    For use off the script thread (see dashboard.warmup): a new version is
+    ingested by load_frame() without a progress bar, and errors propagate to
+    the caller instead of being shown on a page.
+    """
+    path = str(path or DATA_PATH)
+    version = dataset_version(path)
+    if version is None:
+        raise FileNotFoundError(path)
+    return get_frame_store().get_or_load(('dataset', path, version), lambda: _assemble_dataset(path, version))
+
+
+def load_data(path=None):
+    """Load the selected academic performance dataset once per dataset version.
+
+    Every page and session reads the same object. Callers must treat it as
+    read-only.
+    """
+    return load_dataset(path).frame
+
+
+def _ingest_with_progress(path, version):
+    """Stream a new dataset version into its snapshot behind a progress bar.
+
+    Returns the ingested frame, or None when there is nothing to ingest.
+    A failed ingest is shown on the page and raised.
+    """
+    if feather is None or version is None:
+        return None
+    fingerprint = _dataset_fingerprint(path, version)
+    if snapshot_path(path, fingerprint).exists():
+        return None
+    bar = st.progress(0.0, text="Ingesting dataset...")
+    try:
+        with timed('load:ingest'):
+            return ingest_or_parse(path, fingerprint, progress=lambda done, rows: bar.progress(
+                done, text=f"Ingesting dataset... {rows:,} rows"))
+    except Exception as e:
+        st.error(f"🚨 Error ingesting dataset: {e}")
+        raise
+    finally:
+        bar.empty()
+
+
+def dataset_fingerprint(path=None):
+    """Content hash of the current dataset version, computed once per version."""
+    path = str(path or selected_dataset())
+    return _dataset_fingerprint(path, dataset_version(path))
+
+
+@st.cache_resource
+def _dataset_fingerprint(path, version):
+    try:
+        return file_fingerprint(path)
+    except OSError:
+        return 'missing'
+
+
+def load_cube(path=None):
+    """Aggregate cube for the current dataset version, built once and shared."""
+    return load_dataset(path).cube
+
+
+def load_mask_index(path=None):
+    """Per-value filter bitmaps for the current dataset version."""
+    return load_dataset(path).index
+
+
+# =========================================================
+# Filtered Views
+# =========================================================
+class DataView:
+    """A (possibly filtered) frame, its aggregate cube, its cache key and dataset label.
+
+    `groups` is the dataset's GroupIndex and `mask` the view's row mask over
+    the dataset (None when unfiltered), for drill-downs into the view.
+    """
+
+    def __init__(self, frame, cube, key, label=None, groups=None, mask=None):
+        self.frame = frame
+        self.cube = cube
+        self.key = key
+        self.label = label
+        self.groups = groups
+        self.mask = mask
+
+    @property
+    def nbytes(self):
+        size = int(self.frame.memory_usage(deep=True).sum()) + int(self.cube.nbytes)
+        return size + (self.mask.nbytes if self.mask is not None else 0)
+
+
+def load_view(state_key=(), path=None):
+    """Frame, cube and view key for a filter state.
+
+    Without active filters this is the shared full dataset. Filtered views
+    are built from the bitmap index and kept in the frame store per (dataset
+    version, filter state), so every session with the same filters shares
+    one copy.
+    """
+    path = str(path or selected_dataset())
+    dataset = load_dataset(path)
+    fingerprint = _dataset_fingerprint(path, dataset_version(path))
+    mask = dataset.index.mask(state_key) if state_key else None
+    if mask is None:
+        return DataView(dataset.frame, dataset.cube, (fingerprint, ()), dataset.label, dataset.groups)
+
+    def build():
+        with timed('aggregate:filtered_cube', rows=int(mask.sum())):
+            frame = dataset.frame[mask]
+            return DataView(frame, AggregateCube.build(frame), (fingerprint, state_key), dataset.label,
+                            dataset.groups, mask)
+    return get_frame_store().get_or_load(('view', path, dataset_version(path), state_key), build)
+
+
+def sidebar_view(path=None):
+    """Render the dataset pickers, filter sidebar and export; return the matching DataView."""
+    if path is None:
+        render_dataset_selector()
+    filters = render_filter_sidebar(load_mask_index(path))
+    view = load_view(filter_state_key(filters), path)
+    data = load_data(path)
+    st.sidebar.caption(f"Showing {len(view.frame):,} of {len(data):,} students")
+    memory = data.attrs.get('memory_mb')
+    if memory:
+        st.sidebar.caption(f"Held in {memory['after']:,.2f} MB with the compact schema "
+                           f"({memory['before']:,.2f} MB as parsed)")
+    render_export(view)
+    return view
+
+
+def comparison_view():
+    """DataView of the comparison dataset under the current filters, or None."""
+    path = selected_comparison()
+    if path is None:
+        return None
+    if load_data(path).empty:
+        return None
+    return load_view(filter_state_key(st.session_state.get(FILTER_STATE_KEY)), path)
@@ -0,0 +1,86 @@
+import numpy as np
+import streamlit as st
+
+from dashboard.instrument import timed
+from dashboard.plots import (
+    plot_cgpa_by_income_scholarship, plot_cgpa_heatmap, plot_english_probation_heatmap, plot_pc_vs_learning_mode,
+)
+from dashboard.schema import YES_NO_LABELS
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Charts whose cells or bars can be clicked to list their students:
+# plot function -> (column, point field) per group key. The field is 'x' or
+# 'y' for the clicked category, or 'trace' for the name of the clicked
+# trace (its color group).
+DRILLDOWNS = {
+    plot_cgpa_heatmap: (('Admission_Year', 'y'), ('Age_Group', 'x')),
+    plot_cgpa_by_income_scholarship: (('Income_Group', 'x'), ('Meritorious_Scholarship', 'trace')),
+    plot_pc_vs_learning_mode: (('Learning_Mode', 'x'), ('Has_PC', 'trace')),
+    plot_english_probation_heatmap: (('English_Proficiency', 'y'), ('Fell_Probation', 'x')),
+}
+
+# Charts show flags as Yes/No; the group index holds the booleans.
+_FLAG_VALUES = {label: value for value, label in YES_NO_LABELS.items()}
+
+
+def _label(value):
+    return YES_NO_LABELS[value] if isinstance(value, bool) else value
+
+
+def selected_groups(plot_fn, fig, selection):
+    """Group key values of the clicked points, in click order without repeats."""
+    groups = []
+    for point in (selection or {}).get('points', []):
+        values = []
+        for _, field in DRILLDOWNS[plot_fn]:
+            value = fig.data[point['curve_number']].name if field == 'trace' else point.get(field)
+            values.append(_FLAG_VALUES.get(value, value) if isinstance(value, str) else value)
+        if None not in values and tuple(values) not in groups:
+            groups.append(tuple(values))
+    return groups
+
+
+def drilldown_rows(view, dims, groups):
+    """Dataset row positions of the view's students in any of the groups.
+
+    Each group is a slice of the dataset's precomputed group order; a
+    filtered view then keeps the positions its row mask allows, which only
+    touches the group's own rows.
+    """
+    parts = [view.groups.rows(dims, values) for values in groups]
+    rows = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+    if view.mask is not None:
+        rows = rows[view.mask[rows]]
+    return rows
+
+
+def render_drilldown(key, plot_fn, fig, selection, view):
+    """Paged table of the students behind the clicked cells or bars of a chart."""
+    groups = selected_groups(plot_fn, fig, selection)
+    if not groups:
+        st.caption("👆 Click a cell or bar (shift-click for several) to list its students.")
+        return
+
+    dims = [col for col, _ in DRILLDOWNS[plot_fn]]
+    with timed('drilldown:lookup') as record:
+        rows = drilldown_rows(view, dims, groups)
+        record['rows'] = len(rows)
+    described = "; ".join(
+        ", ".join(f"{col.replace('_', ' ')} = {_label(value)}" for col, value in zip(dims, values))
+        for values in groups
+    )
+    st.markdown(f"**👥 {len(rows):,} students** with {described}")
+    if not len(rows):
+        return
+
+    col_size, col_page = st.columns(2)
+    size = col_size.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = -(-len(rows) // size)
+    # A new selection may have fewer pages than the one before it.
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = 1
+    page = col_page.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=f"{key}_page")
+    with timed('drilldown:page', rows=size):
+        table = view.groups.frame.iloc[rows[(page - 1) * size:page * size]]
+    st.dataframe(table, use_container_width=True)
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+from dashboard.rates import cube_rate_table
+from dashboard.registry import ROOT_DIR
+from dashboard.schema import YES_NO_COLUMNS, yes_no
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet export needs pyarrow
+    pq = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # pragma: no cover - Excel export needs openpyxl
+    Workbook = None
+
+# =========================================================
+# Export Settings
+# =========================================================
+# Exported files are written here once per (view, table, format) and reused
+# by later downloads of the same view.
+EXPORT_DIR = Path(os.environ.get("ACADEMIC_EXPORT_DIR", ROOT_DIR / ".cache" / "exports"))
+# Bump whenever the exported columns or their encoding change.
+EXPORT_VERSION = 2
+# Rows converted and written per step, so a large view is never serialized
+# in one piece.
+EXPORT_CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", 100_000))
+# Oldest exports beyond this many files are deleted.
+EXPORT_CACHE_FILES = int(os.environ.get("EXPORT_CACHE_FILES", 32))
+# One header row plus the data rows must fit in an Excel sheet.
+EXCEL_MAX_ROWS = 1_048_575
+# Streamlit holds a downloaded file in memory while it is served, so larger
+# views cannot be exported at row level (a 500,000-row CSV is about 150 MB).
+# Never above the Excel limit, so every format can export any allowed view.
+EXPORT_MAX_ROWS = min(int(os.environ.get("EXPORT_MAX_ROWS", 500_000)), EXCEL_MAX_ROWS)
+
+_locks_lock = threading.Lock()
+_locks = {}
+
+
+# =========================================================
+# Exported Tables
+# =========================================================
+def _metric_summary(cube, by, metric):
+    return cube.stats(by, metric)[['count', 'mean', 'std', 'min', 'max']].reset_index()
+
+
+def _rates(cube, by, flag):
+    return cube_rate_table(cube, by, flag).reset_index()
+
+
+# Aggregate tables behind the page charts, answered from the view's cube:
+# name -> (label, builder).
+AGGREGATE_EXPORTS = {
+    'gender_cgpa': ("CGPA by gender",
+                    lambda cube: _metric_summary(cube, ['Gender'], 'Current_CGPA')),
+    'english_prob_rates': ("Probation rate by English proficiency",
+                           lambda cube: _rates(cube, ['English_Proficiency'], 'Fell_Probation')),
+    'pc_mode_data': ("CGPA by learning mode and PC ownership",
+                     lambda cube: _metric_summary(cube, ['Learning_Mode', 'Has_PC'], 'Current_CGPA')),
+    'skill_dev_data': ("Skill development hours by semester",
+                       lambda cube: _metric_summary(cube, ['Semester'], 'Daily_Skill_Dev_Hours')),
+}
+ROWS_EXPORT = 'students'
+ROWS_LABEL = "Filtered students (row level)"
+
+
+def export_frame(view, table):
+    """The frame exported for `table`: the view's rows or one aggregate table."""
+    if table == ROWS_EXPORT:
+        return view.frame
+    return AGGREGATE_EXPORTS[table][1](view.cube)
+
+
+# =========================================================
+# Chunked Writers
+# =========================================================
+def _chunks(df, chunk_rows):
+    """Row slices of `df`, with Yes/No flags written as the source file's labels."""
+    flags = [col for col in YES_NO_COLUMNS if col in df.columns]
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if flags:
+            chunk = chunk.assign(**{col: yes_no(chunk[col]) for col in flags})
+        yield chunk
+
+
+def write_csv(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    with open(target, 'w', encoding='utf-8', newline='') as fh:
+        for i, chunk in enumerate(_chunks(df, chunk_rows)):
+            chunk.to_csv(fh, header=i == 0, index=False)
+
+
+def write_parquet(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One row group per chunk; every chunk is cast to the first chunk's schema."""
+    writer = None
+    try:
+        for chunk in _chunks(df, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                         schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_excel(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write-only workbook: rows are streamed to disk as they are appended."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    sheet.append([str(col) for col in df.columns])
+    for chunk in _chunks(df, chunk_rows):
+        # Excel has no NaN; missing values become empty cells.
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(target)
+
+
+# Format label -> (extension, MIME type, writer); formats whose library is
+# missing are not offered.
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv', write_csv),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', write_parquet),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', write_excel),
+}
+if pq is None:
+    del EXPORT_FORMATS['Parquet']
+if Workbook is None:
+    del EXPORT_FORMATS['Excel']
+
+
+# =========================================================
+# Cached Export Files
+# =========================================================
+def export_path(view, table, fmt):
+    """Cache location of one export; the view key covers dataset version and filters."""
+    digest = hashlib.sha256(repr(view.key).encode()).hexdigest()[:16]
+    return EXPORT_DIR / f"{view.label}-{digest}-{table}-v{EXPORT_VERSION}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def _prune_exports():
+    files = sorted(EXPORT_DIR.glob('*'), key=lambda f: f.stat().st_mtime, reverse=True)
+    for file in files[EXPORT_CACHE_FILES:]:
+        try:
+            file.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def export_file(view, table, fmt):
+    """Write (or reuse) the export of `table` for a view and return its path.
+
+    Concurrent requests for the same file wait for the first writer.
+    """
+    target = export_path(view, table, fmt)
+    with _locks_lock:
+        lock = _locks.setdefault(target, threading.Lock())
+    with lock:
+        if target.exists():
+            os.utime(target)  # keep recently used exports out of pruning
+            return target
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        EXPORT_FORMATS[fmt][2](export_frame(view, table), tmp)
+        os.replace(tmp, target)
+    _prune_exports()
+    return target
+
+
+def render_export(view):
+    """Sidebar download of the current view's rows or aggregate tables.
+
+    The file is produced by a deferred callable, which Streamlit runs on its
+    own thread when the button is clicked, so the page script never waits
+    for an export. Row-level exports are limited to EXPORT_MAX_ROWS rows,
+    since the served file is held in memory.
+    """
+    tables = {ROWS_LABEL: ROWS_EXPORT, **{label: name for name, (label, _) in AGGREGATE_EXPORTS.items()}}
+    with st.sidebar.expander("📥 Export data"):
+        label = st.selectbox("Table", list(tables), key='_export_table')
+        table = tables[label]
+        if table == ROWS_EXPORT and len(view.frame) > EXPORT_MAX_ROWS:
+            st.caption(f"Row-level export is limited to {EXPORT_MAX_ROWS:,} students; filter the view "
+                       "or export an aggregate table.")
+            return
+        fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key='_export_format')
+        extension, mime, _ = EXPORT_FORMATS[fmt]
+        suffix = '-filtered' if view.key[1] else ''
+        st.download_button(
+            f"Download {fmt}",
+            data=lambda: export_file(view, table, fmt).read_bytes(),
+            file_name=f"{view.label}-{table}{suffix}.{extension}",
+            mime=mime,
+            on_click='ignore',
+            key='_export_download',
+            use_container_width=True,
+        )
@@ -0,0 +1,168 @@
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from dashboard.drilldown import DRILLDOWNS, render_drilldown
+from dashboard.instrument import fragment_rerun, timed
+
+# Upper bound on the serialized size of all cached figures, in megabytes.
+FIGURE_CACHE_MB = float(os.environ.get("FIGURE_CACHE_MB", 64))
+
+
+class SerializedFigure(go.Figure):
+    """A cached figure that hands out the spec captured when it was cached.
+
+    st.plotly_chart serializes a figure through to_dict(), which deep-copies
+    every trace on each render. Cached figures are never modified, so the
+    copy is taken once in FigureCache.put and reused on every rerun.
+    """
+
+    def to_dict(self):
+        return self._spec
+
+
+class FigureCache:
+    """Process-wide LRU cache of Plotly figures, bounded by payload size.
+
+    Entries are keyed by (view key, plot function, parameters), where the view
+    key identifies the dataset version and any filter state. On insert each
+    figure's spec is taken once and encoded to measure its JSON payload;
+    renders reuse that spec, so a cache hit only re-encodes the finished
+    dict. Least recently used figures are evicted once the total exceeds
+    `max_bytes`.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(view_key, plot_fn, params):
+        name = f"{plot_fn.__module__}.{plot_fn.__qualname__}"
+        return (view_key, name, tuple(sorted(params.items())))
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, fig):
+        spec = fig.to_dict()
+        size = len(pio.to_json(spec, validate=False))
+        fig.__class__ = SerializedFigure
+        fig._spec = spec
+        with self._lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (fig, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted
+                self.evictions += 1
+        return fig
+
+    def payload_bytes(self, key):
+        """Serialized size of a cached figure, or None if it is not cached."""
+        with self._lock:
+            entry = self.entries.get(key)
+            return entry[1] if entry else None
+
+    def figure(self, plot_fn, source, view_key, **params):
+        """Return plot_fn(source, **params), building it only on a cache miss."""
+        key = self.make_key(view_key, plot_fn, params)
+        fig = self.get(key)
+        if fig is None:
+            fig = self.put(key, plot_fn(source, **params))
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+@st.cache_resource
+def get_figure_cache():
+    """The figure cache shared by every page and session in this process."""
+    return FigureCache(max_bytes=int(FIGURE_CACHE_MB * 1e6))
+
+
+def show_figure(plot_fn, source, view_key, selection_key=None, **params):
+    """Build a figure through the shared cache and render it with st.plotly_chart.
+
+    Building (or fetching) the figure and sending it to the browser are
+    recorded as separate stages of the rerun, with the payload size. With a
+    `selection_key`, clicked points rerun the script and are returned.
+    Returns (figure, selection or None).
+    """
+    cache = get_figure_cache()
+    name = plot_fn.__name__
+    with timed(f"figure:{name}", rows=len(source) if hasattr(source, '__len__') else None) as record:
+        key = cache.make_key(view_key, plot_fn, params)
+        fig = cache.get(key)
+        record['cached'] = fig is not None
+        if fig is None:
+            fig = cache.put(key, plot_fn(source, **params))
+        record['payload_bytes'] = cache.payload_bytes(key)
+    with timed(f"chart:{name}", payload_bytes=record['payload_bytes']):
+        if selection_key is None:
+            st.plotly_chart(fig, use_container_width=True)
+            return fig, None
+        event = st.plotly_chart(fig, use_container_width=True, on_select='rerun',
+                                selection_mode='points', key=selection_key)
+    return fig, event.selection
+
+
+@st.fragment
+def figure_section(title, key, plot_fn, source, view_key, interpretation=None, caption=False, expanded=False,
+                   params=None, drilldown=None):
+    """A visualization section that is only built while its expander is open.
+
+    The section runs as a fragment: opening or closing it reruns this
+    section alone, and a collapsed section costs nothing on page reruns.
+    The interpretation is shown under the figure as markdown or a caption;
+    `params` are passed on to the plot function. Given the page's DataView
+    as `drilldown`, charts listed in DRILLDOWNS list the students behind a
+    clicked cell or bar, again rerunning only this section. Section-only
+    reruns are logged as reruns of their own, named "fragment:<key>".
+    """
+    with fragment_rerun(f"fragment:{key}"):
+        with st.expander(title, expanded=expanded, key=key, on_change='rerun') as section:
+            if not section.open:
+                return
+            drillable = drilldown is not None and plot_fn in DRILLDOWNS
+            fig, selection = show_figure(plot_fn, source, view_key,
+                                         selection_key=f"{key}_chart" if drillable else None, **(params or {}))
+            if interpretation and caption:
+                st.caption(interpretation)
+            elif interpretation:
+                st.markdown(interpretation)
+            if drillable:
+                render_drilldown(key, plot_fn, fig, selection, drilldown)
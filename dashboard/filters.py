@@ -0,0 +1,212 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# =========================================================
+# Filter Definition
+# =========================================================
+# Multi-select filters: an empty selection means "all values".
+SELECT_FILTERS = ['Program', 'Admission_Year', 'Gender', 'Income_Group', 'Learning_Mode']
+# Range filters: an inclusive (low, high) pair over a small integer column.
+RANGE_FILTERS = ['Semester']
+FILTER_COLUMNS = SELECT_FILTERS + RANGE_FILTERS
+
+# Session-state key holding the filter values shared by all pages.
+STATE_KEY = 'filters'
+
+
+def filter_state_key(filters):
+    """Hashable, order-independent form of a filter dict (active filters only)."""
+    if not filters:
+        return ()
+    items = []
+    for col in FILTER_COLUMNS:
+        value = filters.get(col)
+        if value is None or (col in SELECT_FILTERS and len(value) == 0):
+            continue
+        if col in SELECT_FILTERS:
+            value = tuple(sorted(value, key=str))
+        else:
+            value = tuple(value)
+        items.append((col, value))
+    return tuple(items)
+
+
+# =========================================================
+# Bitmap Index
+# =========================================================
+class MaskIndex:
+    """Precomputed per-value bitmaps for the filterable columns.
+
+    Each distinct value of a filter column gets a packed bitmap (one bit per
+    row). A filter selection ORs the bitmaps of its values; the active
+    filters are ANDed together and unpacked once into a boolean row mask.
+    Per-column masks are memoized, so changing one filter only recomputes
+    that column.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS, max_cached=256):
+        self.n_rows = len(df)
+        self.values = {}
+        self.bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self.values[col] = uniques.tolist()
+            self.bitmaps[col] = {
+                value: np.packbits(codes == i) for i, value in enumerate(self.values[col])
+            }
+        self._column_masks = OrderedDict()
+        self._max_cached = max_cached
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory held by the packed bitmaps."""
+        return sum(b.nbytes for bitmaps in self.bitmaps.values() for b in bitmaps.values())
+
+    def options(self, col):
+        return self.values.get(col, [])
+
+    def column_mask(self, col, selection):
+        """Packed bitmap for one column's selection, memoized."""
+        key = (col, selection)
+        with self._lock:
+            if key in self._column_masks:
+                self._column_masks.move_to_end(key)
+                return self._column_masks[key]
+
+        if col in RANGE_FILTERS:
+            low, high = selection
+            chosen = [v for v in self.values[col] if low <= v <= high]
+        else:
+            chosen = [v for v in selection if v in self.bitmaps[col]]
+        packed = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in chosen:
+            np.bitwise_or(packed, self.bitmaps[col][value], out=packed)
+
+        with self._lock:
+            self._column_masks[key] = packed
+            while len(self._column_masks) > self._max_cached:
+                self._column_masks.popitem(last=False)
+        return packed
+
+    def mask(self, state_key):
+        """Boolean row mask for a filter state, or None when nothing is active."""
+        active = [(col, sel) for col, sel in state_key if col in self.bitmaps]
+        if not active:
+            return None
+        packed = self.column_mask(*active[0]).copy()
+        for col, sel in active[1:]:
+            np.bitwise_and(packed, self.column_mask(col, sel), out=packed)
+        return np.unpackbits(packed, count=self.n_rows).view(bool)
+
+
+# =========================================================
+# Group Index
+# =========================================================
+class GroupIndex:
+    """Row positions of every group of a column combination, for drill-downs.
+
+    For each combination the rows are sorted by their combined group code
+    once (a stable argsort) and the group boundaries are stored as offsets,
+    so the rows of one group are a slice of that order in ascending row
+    order. Combinations are built on first use and kept. Group values are
+    matched by their string form, as they come back from chart clicks.
+    """
+
+    def __init__(self, df):
+        self.frame = df
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory held by the built row orders and offsets."""
+        with self._lock:
+            return sum(order.nbytes + offsets.nbytes for _, order, offsets in self._groups.values())
+
+    def _build(self, dims):
+        lookups, codes = [], []
+        for col in dims:
+            col_codes, uniques = pd.factorize(self.frame[col], sort=True)
+            # Code 0 is kept for missing values.
+            codes.append(col_codes + 1)
+            lookups.append({str(value): i + 1 for i, value in enumerate(uniques)})
+        shape = tuple(len(lookup) + 1 for lookup in lookups)
+        combined = np.ravel_multi_index(codes, shape)
+        dtype = np.int32 if len(self.frame) < 2 ** 31 else np.int64
+        order = np.argsort(combined, kind='stable').astype(dtype)
+        offsets = np.zeros(int(np.prod(shape)) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(combined, minlength=len(offsets) - 1), out=offsets[1:])
+        return lookups, order, offsets
+
+    def groups(self, dims):
+        """(value lookups, row order, offsets) for a column combination."""
+        dims = tuple(dims)
+        with self._lock:
+            if dims not in self._groups:
+                self._groups[dims] = self._build(dims)
+            return self._groups[dims]
+
+    def rows(self, dims, values):
+        """Row positions of the group where each column in `dims` equals its value."""
+        lookups, order, offsets = self.groups(dims)
+        try:
+            code = tuple(lookup[str(value)] for lookup, value in zip(lookups, values))
+        except KeyError:
+            return order[:0]
+        group = np.ravel_multi_index(code, tuple(len(lookup) + 1 for lookup in lookups))
+        return order[offsets[group]:offsets[group + 1]]
+
+
+# =========================================================
+# Sidebar Widgets
+# =========================================================
+def render_filter_sidebar(index):
+    """Draw the global filter widgets and return the current filter dict.
+
+    Values live in st.session_state['filters'] rather than in the widget keys,
+    so they survive navigation between pages.
+    """
+    filters = st.session_state.setdefault(STATE_KEY, {})
+
+    st.sidebar.header("Filters")
+    for col in SELECT_FILTERS:
+        options = index.options(col)
+        if not options:
+            continue
+        current = [v for v in filters.get(col, []) if v in options]
+        filters[col] = st.sidebar.multiselect(
+            col.replace('_', ' '), options, default=current,
+            key=f"_filter_{col}", placeholder="All"
+        )
+
+    for col in RANGE_FILTERS:
+        options = index.options(col)
+        if not options:
+            continue
+        low, high = int(min(options)), int(max(options))
+        current = filters.get(col) or (low, high)
+        current = (max(low, current[0]), min(high, current[1]))
+        if low < high:
+            value = tuple(st.sidebar.slider(
+                col.replace('_', ' '), low, high, value=current,
+                key=f"_filter_{col}"
+            ))
+        else:
+            value = (low, high)
+        # A full range is the same as no filter.
+        filters[col] = None if value == (low, high) else value
+
+    if st.sidebar.button("Reset filters"):
+        st.session_state[STATE_KEY] = {}
+        for col in FILTER_COLUMNS:
+            st.session_state.pop(f"_filter_{col}", None)
+        st.rerun()
+
+    return dict(filters)
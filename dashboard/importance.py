@@ -0,0 +1,295 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard.instrument import instrumented
+from dashboard.schema import DERIVED_COLUMNS
+
+# =========================================================
+# Ranking Settings
+# =========================================================
+FACTOR_TARGETS = ['Current_CGPA', 'Fell_Probation']
+# Columns never ranked: the targets, and derived group columns whose source
+# column (Age, Monthly_Family_Income) is ranked instead.
+EXCLUDED_COLUMNS = set(FACTOR_TARGETS) | set(DERIVED_COLUMNS)
+# Numeric factors are cut into this many quantile bins for mutual
+# information, and categorical factors keep their most frequent levels with
+# the rest pooled, so every factor is compared at the same resolution.
+MAX_LEVELS = 16
+N_PERMUTATIONS = int(os.environ.get("IMPORTANCE_PERMUTATIONS", 5))
+# The model is fitted and scored on a random sample of at most this many rows.
+MODEL_SAMPLE_ROWS = int(os.environ.get("IMPORTANCE_SAMPLE_ROWS", 200_000))
+HOLDOUT_SHARE = 0.25
+# Ridge penalty per training row, on standardized factors.
+RIDGE_PENALTY = 0.01
+# Numeric values are clipped to these quantiles before any statistic, so a
+# few data-entry outliers (a CGPA of 310) cannot dominate the ranking.
+CLIP_QUANTILES = (0.01, 0.99)
+IMPORTANCE_WORKERS = int(os.environ.get("IMPORTANCE_WORKERS", os.cpu_count() or 1))
+# Scoring work is counted in rows scanned per factor and target: every row
+# once for the correlation ratio and mutual information, and every held-out
+# row once per permutation, at about this many times the cost.
+PERMUTATION_COST = 4
+# Below this much scoring work (about a second in-process, reached from
+# roughly 3.5M rows) the factors are scored in-process; starting worker
+# processes and copying the codes to them would cost more than it saves.
+PARALLEL_MIN_ELEMENTS = 250_000_000
+
+
+# =========================================================
+# Factor Encoding
+# =========================================================
+def factor_kinds(df):
+    """'numeric' or 'category' for every rankable column with two or more values.
+
+    Booleans and ordered categoricals count as numeric (by value or by rank).
+    """
+    kinds = {}
+    for col in df.columns:
+        if col in EXCLUDED_COLUMNS or df[col].nunique() < 2:
+            continue
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            kinds[col] = 'numeric' if dtype.ordered else 'category'
+        elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+            kinds[col] = 'numeric'
+        else:
+            kinds[col] = 'category'
+    return kinds
+
+
+def numeric_values(series, clip=CLIP_QUANTILES):
+    """float64 values of a numeric factor, clipped to the `clip` quantiles.
+
+    Ordered categories give their value, or their rank if not numeric.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        categories = series.cat.categories
+        ranks = categories.to_numpy(dtype='float64') if pd.api.types.is_numeric_dtype(categories) \
+            else np.arange(len(categories), dtype='float64')
+        values = np.where(codes >= 0, ranks[codes], np.nan)
+    else:
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+    if clip is not None and np.isfinite(values).any():
+        values = np.clip(values, *np.nanquantile(values, clip))
+    return values
+
+
+def level_codes(values, kind, levels=MAX_LEVELS):
+    """Integer codes in [0, levels] for mutual information and one-hot encoding.
+
+    Takes numeric_values() of a numeric factor, or the column itself for a
+    categorical one. Numeric factors with more distinct values than `levels`
+    are cut at their quantiles; categorical factors keep their `levels - 1`
+    most frequent values. Missing values get a code of their own.
+    """
+    if kind == 'numeric':
+        finite = np.isfinite(values)
+        distinct = np.unique(values[finite])
+        if len(distinct) <= levels:
+            codes = np.searchsorted(distinct, values)
+        else:
+            edges = np.unique(np.quantile(values[finite], np.linspace(0, 1, levels + 1)[1:-1]))
+            codes = np.searchsorted(edges, values, side='right')
+        return np.where(finite, codes, levels).astype(np.int16)
+
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    keep = np.full(len(uniques), levels - 1, dtype=np.int16)
+    keep[np.argsort(-counts, kind='stable')[:levels - 1]] = np.arange(min(len(uniques), levels - 1))
+    return np.where(codes >= 0, keep[codes], levels).astype(np.int16)
+
+
+# =========================================================
+# Vectorized Associations
+# =========================================================
+def _standardize(matrix):
+    """Column-standardized copy with missing values at the mean (zero)."""
+    mean = np.nanmean(matrix, axis=0)
+    std = np.nanstd(matrix, axis=0)
+    std[std == 0] = 1
+    return np.nan_to_num((matrix - mean) / std)
+
+
+def correlation_matrix(frame):
+    """Pearson correlations of all columns of a float frame with one matrix product."""
+    z = _standardize(frame.to_numpy(dtype='float64'))
+    corr = z.T @ z / len(z)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=frame.columns, columns=frame.columns)
+
+
+def correlation_ratio(codes, y):
+    """Correlation ratio (eta) of a target over the groups of a categorical factor."""
+    n = np.bincount(codes, minlength=codes.max() + 1)
+    sums = np.bincount(codes, weights=y, minlength=len(n))
+    keep = n > 0
+    between = (sums[keep] ** 2 / n[keep]).sum() - y.sum() ** 2 / len(y)
+    total = ((y - y.mean()) ** 2).sum()
+    return float(np.sqrt(max(between, 0) / total)) if total > 0 else float('nan')
+
+
+def mutual_information(x_codes, y_codes):
+    """Mutual information in nats from the joint histogram of two code arrays."""
+    ny = int(y_codes.max()) + 1
+    joint = np.bincount(x_codes.astype(np.int64) * ny + y_codes, minlength=(int(x_codes.max()) + 1) * ny)
+    joint = joint.reshape(-1, ny) / len(x_codes)
+    outer = joint.sum(axis=1, keepdims=True) * joint.sum(axis=0, keepdims=True)
+    nonzero = joint > 0
+    return float((joint[nonzero] * np.log(joint[nonzero] / outer[nonzero])).sum())
+
+
+# =========================================================
+# Permutation Importance
+# =========================================================
+def design_blocks(kinds, values, codes):
+    """Standardized numeric columns and one-hot categorical columns, per factor."""
+    blocks = {}
+    for col, kind in kinds.items():
+        if kind == 'numeric':
+            blocks[col] = _standardize(values[col][:, None])
+        else:
+            blocks[col] = np.eye(MAX_LEVELS + 1)[codes[col]]
+    return blocks
+
+
+def fit_ridge(blocks, y, train):
+    """Ridge least squares on the training rows; returns (intercept, weights per factor)."""
+    x = np.hstack(list(blocks.values()))[train]
+    x_mean, y_mean = x.mean(axis=0), y[train].mean()
+    xc = x - x_mean
+    gram = xc.T @ xc + RIDGE_PENALTY * len(x) * np.eye(x.shape[1])
+    weights = np.linalg.solve(gram, xc.T @ (y[train] - y_mean))
+    split = np.cumsum([b.shape[1] for b in blocks.values()])[:-1]
+    return y_mean - x_mean @ weights, dict(zip(blocks, np.split(weights, split)))
+
+
+def _permutation_chunk(contributions, y, prediction, n_repeats, seeds):
+    """R² lost when each factor's contribution is shuffled.
+
+    The model is linear, so shuffling a factor only replaces its own
+    contribution to the prediction; the design matrix is never rebuilt.
+    Each factor draws from its own seed, so the result does not depend on
+    how factors are grouped.
+    """
+    total = ((y - y.mean()) ** 2).sum()
+    base = ((y - prediction) ** 2).sum()
+    drops = {}
+    for (name, contribution), seed in zip(contributions.items(), seeds):
+        rng = np.random.default_rng(seed)
+        losses = []
+        for _ in range(n_repeats):
+            shuffled = prediction - contribution + contribution[rng.permutation(len(y))]
+            losses.append(((y - shuffled) ** 2).sum() - base)
+        drops[name] = float(np.mean(losses) / total) if total > 0 else float('nan')
+    return drops
+
+
+def permutation_importance(contributions, y, prediction, n_repeats=N_PERMUTATIONS, seed=0):
+    """Mean R² drop per factor."""
+    seeds = np.random.SeedSequence(seed).spawn(len(contributions))
+    return _permutation_chunk(contributions, y, prediction, n_repeats, seeds)
+
+
+def _factor_scores(codes, categorical, y, y_codes, contributions, holdout_y, prediction, n_repeats, seeds):
+    """Worker entry point: scores of one group of factors against one target.
+
+    Returns (correlation ratios of the `categorical` factors, mutual
+    information, permutation drops), each keyed by factor.
+    """
+    ratios = {col: correlation_ratio(codes[col], y) for col in categorical}
+    information = {col: mutual_information(col_codes, y_codes) for col, col_codes in codes.items()}
+    drops = _permutation_chunk(contributions, holdout_y, prediction, n_repeats, seeds)
+    return ratios, information, drops
+
+
+def score_factors(jobs, workers=IMPORTANCE_WORKERS):
+    """_factor_scores() of every job, in one pool of worker processes when workers > 1."""
+    if workers <= 1:
+        return [_factor_scores(*job) for job in jobs]
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+        futures = [pool.submit(_factor_scores, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+# =========================================================
+# Factor Ranking
+# =========================================================
+def rank_factors(df, targets=FACTOR_TARGETS, seed=0, workers=IMPORTANCE_WORKERS):
+    """Rank every factor by its association with each target.
+
+    Returns {'rankings': {target: table}, 'correlations': matrix}. Each table
+    has one row per factor with its kind, correlation (Pearson r for numeric
+    factors, correlation ratio for categorical ones), mutual information and
+    permutation importance (held-out R² lost by a ridge model when the
+    factor is shuffled), sorted by permutation importance. Large frames are
+    scored in `workers` processes, one group of factors each.
+    """
+    kinds = factor_kinds(df)
+    numeric = [col for col, kind in kinds.items() if kind == 'numeric']
+    targets = [t for t in targets if t in df.columns]
+    values = {col: numeric_values(df[col]) for col in numeric + targets}
+    codes = {col: level_codes(values[col] if kind == 'numeric' else df[col], kind) for col, kind in kinds.items()}
+    correlations = correlation_matrix(pd.DataFrame(values, index=df.index))
+
+    rng = np.random.default_rng(seed)
+    sample = rng.permutation(len(df))[:MODEL_SAMPLE_ROWS]
+    blocks = design_blocks(kinds, {col: v[sample] for col, v in values.items()},
+                           {col: c[sample] for col, c in codes.items()})
+    holdout = np.zeros(len(sample), dtype=bool)
+    holdout[:max(1, int(len(sample) * HOLDOUT_SHARE))] = True
+
+    # Every target is scored on the same factor groups, split per worker only
+    # when the work is large enough to pay for the pool.
+    names = list(kinds)
+    seeds = np.random.SeedSequence(seed).spawn(len(names))
+    work = len(targets) * len(names) * (len(df) + PERMUTATION_COST * N_PERMUTATIONS * holdout.sum())
+    if work < PARALLEL_MIN_ELEMENTS:
+        workers = 1
+    groups = [part for part in np.array_split(np.arange(len(names)), max(workers, 1)) if len(part)]
+
+    jobs = []
+    for target in targets:
+        y = values[target]
+        y_codes = level_codes(y, 'numeric')
+        intercept, weights = fit_ridge(blocks, y[sample], ~holdout)
+        contributions = {col: blocks[col][holdout] @ weights[col] for col in kinds}
+        prediction = intercept + sum(contributions.values())
+        for group in groups:
+            cols = [names[i] for i in group]
+            jobs.append((
+                {col: codes[col] for col in cols}, [col for col in cols if kinds[col] == 'category'],
+                y, y_codes, {col: contributions[col] for col in cols}, y[sample][holdout], prediction,
+                N_PERMUTATIONS, [seeds[i] for i in group],
+            ))
+    scores = iter(score_factors(jobs, workers))
+
+    rankings = {}
+    for target in targets:
+        ratios, information, drops = {}, {}, {}
+        for _ in groups:
+            group_ratios, group_information, group_drops = next(scores)
+            ratios.update(group_ratios)
+            information.update(group_information)
+            drops.update(group_drops)
+        table = pd.DataFrame({
+            'kind': pd.Series(kinds),
+            'correlation': {col: correlations.loc[col, target] if kind == 'numeric'
+                            else ratios[col] for col, kind in kinds.items()},
+            'mutual_info': pd.Series(information),
+            'permutation': pd.Series(drops),
+        })
+        rankings[target] = table.sort_values('permutation', ascending=False)
+    return {'rankings': rankings, 'correlations': correlations}
+
+
+@instrumented('stats')
+@st.cache_data(show_spinner="Ranking factors...")
+def factor_ranking(view_key, _df):
+    """rank_factors() for a view, cached per dataset version and filter state."""
+    return rank_factors(_df)
@@ -0,0 +1,127 @@
+"""Chunked streaming ingest of student CSVs into columnar snapshots.
+
+The CSV is parsed a fixed number of rows at a time. Each chunk gets its
+derived group columns, is validated and cast by the compact schema, folded
+into the aggregate cube and appended to an Arrow IPC (Feather v2) file, so
+peak memory follows the chunk size rather than the file size.
+
+When a file only grew by appended rows, an existing snapshot is copied
+batch by batch and only the new bytes are parsed.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from dashboard.aggregates import AggregateCube
+from dashboard.schema import SchemaError, apply_schema
+
+INGEST_CHUNK_ROWS = int(os.environ.get("INGEST_CHUNK_ROWS", 200_000))
+# Chunk cubes are merged in batches; merging is cheap per group but has a
+# fixed per-call cost.
+CUBE_MERGE_BATCH = 16
+
+
+class _CategoryUnion:
+    """Append-only category lists shared by every chunk of one file.
+
+    Each chunk's unordered categoricals are re-coded against the running
+    list, so later chunks only ever add dictionary entries and the snapshot
+    can be written as dictionary deltas.
+    """
+
+    def __init__(self):
+        self.categories = {}
+
+    @classmethod
+    def from_table(cls, table):
+        """Seed the running lists from the dictionaries of an existing snapshot."""
+        union = cls()
+        for name in table.column_names:
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type) and column.num_chunks:
+                union.categories[name] = column.chunk(column.num_chunks - 1).dictionary.to_pylist()
+        return union
+
+    def align(self, chunk):
+        for col in chunk.columns:
+            dtype = chunk[col].dtype
+            if not isinstance(dtype, pd.CategoricalDtype) or dtype.ordered:
+                continue
+            known = self.categories.setdefault(col, [])
+            seen = set(known)
+            known.extend(sorted(c for c in dtype.categories if c not in seen))
+            chunk[col] = chunk[col].cat.set_categories(known)
+        return chunk
+
+
+def iter_prepared_chunks(source, chunk_rows=INGEST_CHUNK_ROWS, offset=0, columns=None, union=None):
+    """Yield (schema-cast chunk, bytes read so far, total bytes) for a CSV.
+
+    With an `offset`, parsing starts at that byte and `columns` supplies the
+    header, which is then not expected in the file.
+    """
+    total = os.path.getsize(source)
+    union = union or _CategoryUnion()
+    header = 'infer' if columns is None else None
+    with open(source, 'rb') as fh:
+        fh.seek(offset)
+        for chunk in pd.read_csv(fh, chunksize=chunk_rows, header=header, names=columns):
+            yield union.align(apply_schema(chunk)), fh.tell(), total
+
+
+def stream_csv(source, target, chunk_rows=INGEST_CHUNK_ROWS, progress=None,
+               base=None, offset=0, columns=None):
+    """Stream a CSV into an uncompressed Feather file and an aggregate cube.
+
+    `progress(fraction, rows)` is called after every chunk. The snapshot is
+    written to a temporary file and moved into place only when complete.
+    With `base`, that snapshot's rows are copied first and only the CSV from
+    byte `offset` on is parsed. Returns (cube of the parsed rows, total rows,
+    memory of the parsed rows in MB before and after the schema cast); cube
+    group keys still carry per-chunk dtypes.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    writer, schema, union, cubes, rows = None, None, None, [], 0
+    memory = {'before': 0.0, 'after': 0.0}
+    try:
+        if base is not None:
+            table = feather.read_table(base, memory_map=True)
+            schema = table.schema
+            writer = pa.ipc.new_file(tmp, schema, options=options)
+            writer.write_table(table)
+            union = _CategoryUnion.from_table(table)
+            rows = table.num_rows
+
+        chunks = iter_prepared_chunks(source, chunk_rows, offset, columns, union)
+        for chunk, done, total in chunks:
+            # Per-chunk figures would otherwise end up in the snapshot's metadata.
+            for key, value in chunk.attrs.pop('memory_mb').items():
+                memory[key] += value
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(tmp, schema, options=options)
+            writer.write_table(table)
+
+            cubes.append(AggregateCube.build(chunk))
+            if len(cubes) >= CUBE_MERGE_BATCH:
+                cubes = [AggregateCube.combine(cubes)]
+            rows += len(chunk)
+            if progress:
+                progress(min((done - offset) / (total - offset), 1.0) if total > offset else 1.0, rows)
+        if not cubes:
+            raise SchemaError(f"{source} contains no new rows" if base else f"{source} contains no rows")
+        writer.close()
+        writer = None
+        os.replace(tmp, target)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+    return AggregateCube.combine(cubes), rows, memory
@@ -0,0 +1,276 @@
+"""Per-rerun timing of the load, aggregation, figure and chart stages.
+
+Pages call begin_rerun() first and end_rerun() last, including before an
+early st.stop(); instrumented code wraps its work in
+``with timed(stage, rows=...)`` or the @instrumented decorator. end_rerun()
+appends one JSON line per rerun to METRICS_LOG when that is set and, when
+the debug panel is enabled (DASHBOARD_DEBUG=1 or ``?debug=1`` in the URL),
+shows the timings in the sidebar together with an opt-in profile of one
+rerun. A rerun cut short by st.rerun() or an exception is logged as
+unfinished when the next one begins.
+"""
+import functools
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from dashboard.registry import ROOT_DIR
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - cProfile is always available
+    pyinstrument = None
+
+# =========================================================
+# Settings
+# =========================================================
+# One JSON object per rerun is appended to this file when it is set, e.g. to
+# .cache/metrics.jsonl while measuring; the log is not rotated.
+METRICS_LOG = os.environ.get("DASHBOARD_METRICS_LOG", "")
+# Profiles of single reruns are saved here for snakeviz / pyinstrument viewers.
+PROFILE_DIR = Path(os.environ.get("DASHBOARD_PROFILE_DIR", ROOT_DIR / ".cache" / "profiles"))
+DEBUG = os.environ.get("DASHBOARD_DEBUG") == "1"
+# 'cprofile' or 'pyinstrument' (used only when installed).
+PROFILER = os.environ.get("DASHBOARD_PROFILER", "cprofile")
+
+DEBUG_STATE_KEY = '_debug_panel'
+PROFILE_STATE_KEY = '_profile_next_rerun'
+
+# Each session's script runs in its own thread, so the rerun being recorded
+# is tracked per thread.
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+# =========================================================
+# Recording
+# =========================================================
+def _rerun():
+    return getattr(_local, 'rerun', None)
+
+
+@contextmanager
+def timed(stage, rows=None, **extra):
+    """Time a block as one stage of the current rerun.
+
+    Yields the stage record, so the block can add fields such as
+    payload_bytes or cached. Outside a recorded rerun this only times.
+    """
+    record = {'stage': stage, 'rows': rows, **extra}
+    depth = getattr(_local, 'depth', 0)
+    record['depth'] = depth
+    rerun = _rerun()
+    if rerun is not None:
+        rerun['stages'].append(record)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        _local.depth = depth
+
+
+def _rows(args):
+    for arg in args:
+        if isinstance(arg, pd.DataFrame):
+            return len(arg)
+    return None
+
+
+def instrumented(kind):
+    """Decorator recording every call of a function as stage '<kind>:<name>'."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(f"{kind}:{fn.__name__}", rows=_rows(args)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# =========================================================
+# Rerun Lifecycle
+# =========================================================
+def debug_enabled():
+    """Whether the timing panel is shown; ?debug=1 turns it on for the session."""
+    if st.query_params.get('debug') == '1':
+        st.session_state[DEBUG_STATE_KEY] = True
+    return DEBUG or st.session_state.get(DEBUG_STATE_KEY, False)
+
+
+def _start_profiler():
+    if PROFILER == 'pyinstrument' and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+    if hasattr(profiler, 'enable'):
+        profiler.enable()
+    else:
+        profiler.start()
+    return profiler
+
+
+def _save_profile(profiler, target):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    if hasattr(profiler, 'dump_stats'):
+        profiler.dump_stats(target)
+    else:
+        target.write_text(profiler.output_html())
+
+
+def _stop_profiler(profiler, page):
+    """Stop a profiler and return (saved file or None, text report)."""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    target = PROFILE_DIR / f"{''.join(c if c.isalnum() else '_' for c in page)}-{stamp}"
+    if hasattr(profiler, 'disable'):
+        import pstats
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(25)
+        text, target = out.getvalue(), target.with_suffix('.prof')
+    else:
+        profiler.stop()
+        text, target = profiler.output_text(), target.with_suffix('.html')
+    try:
+        _save_profile(profiler, target)
+    except OSError:
+        target = None
+    return target, text
+
+
+def begin_rerun(page, profile=True):
+    """Start recording a rerun of `page`; profiles it if one was requested.
+
+    A record still open in this thread belongs to a rerun that never reached
+    end_rerun(); it is logged as unfinished first.
+    """
+    stale = _rerun()
+    if stale is not None:
+        _local.rerun = None
+        _finish(stale, unfinished=True)
+    profiler = None
+    if profile and st.session_state.pop(PROFILE_STATE_KEY, False):
+        profiler = _start_profiler()
+    _local.depth = 0
+    _local.rerun = {'page': page, 'start': time.perf_counter(), 'stages': [], 'profiler': profiler}
+
+
+def _write_metrics(entry):
+    if not METRICS_LOG:
+        return
+    try:
+        path = Path(METRICS_LOG)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _log_lock, open(path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps(entry) + '\n')
+    except OSError:
+        pass
+
+
+def _finish(rerun, **extra):
+    """Stop a rerun's profiler and log it; returns (log entry, profile report or None)."""
+    total = time.perf_counter() - rerun['start']
+    report = None
+    if rerun['profiler'] is not None:
+        report = _stop_profiler(rerun['profiler'], rerun['page'])
+
+    stages = rerun['stages']
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'page': rerun['page'],
+        'total_s': total,
+        'untracked_s': total - sum(s['seconds'] for s in stages if s['depth'] == 0),
+        'stages': stages,
+        **extra,
+    }
+    _write_metrics(entry)
+    return entry, report
+
+
+def end_rerun(panel=True):
+    """Finish the current rerun: log its stages and draw the debug panel.
+
+    `panel=False` only logs, for fragments, which cannot draw in the sidebar.
+    """
+    rerun = _rerun()
+    if rerun is None:
+        return
+    _local.rerun = None
+    entry, report = _finish(rerun)
+    if panel and debug_enabled():
+        render_debug_panel(entry, report)
+
+
+@contextmanager
+def fragment_rerun(name):
+    """Record a fragment's work in the page's rerun, or as a rerun of its own.
+
+    On a full rerun the fragment runs inside the page's record. When only the
+    fragment reruns, one named `name` is opened and logged around the
+    fragment body; a page record still open then is left over from an
+    interrupted rerun, and begin_rerun() logs it as unfinished.
+    """
+    ctx = get_script_run_ctx()
+    fragment_only = ctx is not None and bool(ctx.fragment_ids_this_run)
+    if _rerun() is not None and not fragment_only:
+        yield
+        return
+    begin_rerun(name, profile=False)
+    try:
+        yield
+    finally:
+        end_rerun(panel=False)
+
+
+# =========================================================
+# Debug Panel
+# =========================================================
+def render_debug_panel(entry, report=None):
+    from dashboard.figures import get_figure_cache
+    from dashboard.store import get_frame_store
+    from dashboard.warmup import start_warmup
+
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        st.caption(f"{entry['page']}: {entry['total_s'] * 1000:,.0f} ms total, "
+                   f"{entry['untracked_s'] * 1000:,.0f} ms outside tracked stages")
+        if entry['stages']:
+            table = pd.DataFrame(entry['stages'])
+            table['stage'] = ['  ' * d + s for d, s in zip(table['depth'], table['stage'])]
+            table['ms'] = table.pop('seconds') * 1000
+            columns = [c for c in ['stage', 'ms', 'rows', 'payload_bytes', 'cached'] if c in table.columns]
+            st.dataframe(table[columns], hide_index=True, use_container_width=True,
+                         column_config={'ms': st.column_config.NumberColumn(format="%.1f")})
+
+        figures, frames = get_figure_cache().stats(), get_frame_store().stats()
+        st.caption(f"Figure cache: {figures['entries']} figures, {figures['bytes'] / 1e6:.1f} MB, "
+                   f"hit rate {figures['hit_rate']:.0%}")
+        st.caption(f"Frame store: {frames['entries']} entries, {frames['bytes'] / 1e6:.1f} of "
+                   f"{frames['max_bytes'] / 1e6:.0f} MB, {frames['evictions']} evictions")
+        warmer = start_warmup()
+        if warmer is not None and warmer.last_run is not None:
+            warm = warmer.stats()
+            st.caption(f"Warm-up: {warm['runs']} runs, last {time.time() - warm['last_run']:,.0f} s ago "
+                       f"in {warm['last_seconds']:.1f} s")
+            if warm['last_error']:
+                st.caption(f"Last warm-up error: {warm['last_error']}")
+
+        if st.button("Profile next rerun", key='_profile_button'):
+            st.session_state[PROFILE_STATE_KEY] = True
+            st.rerun()
+        if report is not None:
+            target, text = report
+            if target is not None:
+                st.caption(f"Profile saved to {target}")
+            st.code(text, language=None)
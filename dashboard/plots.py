@@ -0,0 +1,220 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboard.charts import add_cell_targets, box_plot, scatter_with_trend
+from dashboard.schema import ENGLISH_ORDER, YES_NO_LABELS, yes_no
+
+# =========================================================
+# Dashboard Figures
+# =========================================================
+# Every chart shown by the pages. Functions taking `data` read student rows;
+# functions taking `cube` read an AggregateCube. None of them touch
+# Streamlit, so they can be built headless (see benchmarks/).
+
+# ---------------------------------------------------------
+# Objective 1: Socio-economic and Demographic Influence
+# ---------------------------------------------------------
+def plot_cgpa_vs_gender(data):
+    fig = box_plot(
+        data, x='Gender', y='Current_CGPA',
+        color='Gender',
+        title="CGPA Distribution by Gender",
+        color_discrete_map={'Male': 'blue', 'Female': 'red'},
+        height=450, range_y=[2.0, 4.0]
+    )
+    fig.update_layout(xaxis_title="Gender", yaxis_title="Current CGPA")
+    return fig
+
+
+def plot_cgpa_heatmap(cube):
+    grouped = cube.mean(['Admission_Year', 'Age_Group'], 'Current_CGPA').unstack()
+    grouped.index = grouped.index.astype(str)
+    fig = px.imshow(
+        grouped,
+        x=grouped.columns,
+        y=grouped.index,
+        color_continuous_scale="YlGnBu",
+        text_auto=".2f",
+        title="Average CGPA by Admission Year and Age Group",
+        height=500
+    )
+    fig.update_layout(xaxis_title="Age Group", yaxis_title="Admission Year")
+    return add_cell_targets(fig, grouped, "Age Group=%{x}<br>Admission Year=%{y}<br>"
+                                          "Average CGPA=%{customdata:.2f}<extra></extra>")
+
+
+def plot_cgpa_by_income_scholarship(cube):
+    grouped = cube.mean(['Income_Group', 'Meritorious_Scholarship'], 'Current_CGPA').rename('Current_CGPA').reset_index()
+    grouped['Meritorious_Scholarship'] = yes_no(grouped['Meritorious_Scholarship'])
+    fig = px.bar(
+        grouped,
+        x='Income_Group',
+        y='Current_CGPA',
+        color='Meritorious_Scholarship',
+        barmode='group',
+        title="Average CGPA by Family Income and Scholarship Status",
+        labels={'Current_CGPA': 'Average CGPA', 'Meritorious_Scholarship': 'Scholarship'},
+        color_discrete_map={'Yes': 'green', 'No': 'red'},
+        height=500
+    )
+    fig.update_layout(xaxis_title="Family Income Group", yaxis_title="Average CGPA")
+    return fig
+
+
+# ---------------------------------------------------------
+# Objective 2: Study Habits and Resource Utilization
+# ---------------------------------------------------------
+def plot_cgpa_vs_social_media(data):
+    fig = box_plot(
+        data,
+        x='Daily_Social_Media_Hours',
+        y='Current_CGPA',
+        color='Daily_Social_Media_Hours',
+        title='Visualization 1: CGPA Distribution by Daily Social Media Hours',
+        height=550,
+        range_y=[2.0,4.0]
+    )
+    order_array = list(data['Daily_Social_Media_Hours'].cat.categories)
+    fig.update_layout(
+        xaxis={'categoryorder':'array','categoryarray':order_array},
+        xaxis_title='Daily Social Media Hours (Hours)',
+        yaxis_title='Current CGPA',
+        showlegend=False
+    )
+    return fig
+
+
+def plot_cgpa_vs_attendance(data):
+    fig = scatter_with_trend(
+        data,
+        x='Attendance_Pct',
+        y='Current_CGPA',
+        title='Visualization 2: Current CGPA vs. Class Attendance Percentage',
+        height=500,
+        range_x=[0,100],
+        range_y=[2.0,4.0]
+    )
+    fig.update_layout(xaxis_title='Class Attendance (%)', yaxis_title='Current CGPA')
+    return fig
+
+
+def plot_pc_vs_learning_mode(cube):
+    pc_mode_data = cube.mean(['Learning_Mode','Has_PC'], 'Current_CGPA').rename('Current_CGPA').reset_index()
+    pc_mode_data['Has_PC'] = yes_no(pc_mode_data['Has_PC'])
+    fig = px.bar(
+        pc_mode_data,
+        x='Learning_Mode',
+        y='Current_CGPA',
+        color='Has_PC',
+        barmode='group',
+        title='Visualization 4: Average CGPA — PC Ownership vs. Learning Mode',
+        labels={'Current_CGPA':'Average CGPA','Has_PC':'Has Personal Computer?'},
+        height=500,
+        color_discrete_map={'Yes':'#E41A1C','No':'#377EB8'}
+    )
+    fig.update_layout(xaxis_title='Learning Mode', yaxis_title='Average Current CGPA')
+    return fig
+
+
+# ---------------------------------------------------------
+# Objective 3: Academic Challenges and Student Engagement
+# ---------------------------------------------------------
+def plot_cgpa_by_probation_consultancy(data):
+    box_data = data[['Fell_Probation', 'Attends_Consultancy', 'Current_CGPA']].assign(
+        Fell_Probation=yes_no(data['Fell_Probation']),
+        Attends_Consultancy=yes_no(data['Attends_Consultancy'])
+    )
+    fig = box_plot(
+        box_data,
+        x='Fell_Probation',
+        y='Current_CGPA',
+        color='Attends_Consultancy',
+        title='CGPA Distribution by Probation Status and Consultancy Attendance',
+        labels={'Fell_Probation':'Did you ever fall in probation?', 'Attends_Consultancy':'Attends Consultancy?'},
+        height=500,
+        range_y=[2.0, 4.0],
+        color_discrete_map={'Yes':'lightsalmon', 'No':'skyblue'}
+    )
+    return fig
+
+
+def plot_skill_dev_by_semester(cube):
+    skill_dev_data = cube.mean(['Semester'], 'Daily_Skill_Dev_Hours').rename('Daily_Skill_Dev_Hours').reset_index()
+    fig = px.line(
+        skill_dev_data,
+        x='Semester',
+        y='Daily_Skill_Dev_Hours',
+        title='Average Daily Skill Development Hours by Current Semester',
+        markers=True,
+        height=500
+    )
+    return fig
+
+
+def plot_english_probation_heatmap(cube):
+    count_data = cube.count(['English_Proficiency','Fell_Probation']).unstack(fill_value=0)
+    count_data = count_data.rename(columns=YES_NO_LABELS)
+    count_data = count_data.reindex(index=ENGLISH_ORDER)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=count_data.values,
+        x=count_data.columns,
+        y=count_data.index,
+        colorscale='Reds',
+        hoverongaps=False
+    ))
+
+    # Add annotation counts
+    annotations = []
+    for i, row in enumerate(count_data.index):
+        for j, col in enumerate(count_data.columns):
+            annotations.append(dict(
+                x=col, y=row,
+                text=str(count_data.iloc[i, j]),
+                showarrow=False,
+                font=dict(color="black")
+            ))
+    fig.update_layout(
+        title='Student Count by English Proficiency and Probation Status',
+        xaxis_title='Did you ever fall in probation?',
+        yaxis_title='English Language Proficiency',
+        annotations=annotations,
+        height=500
+    )
+    fig.update_coloraxes(colorbar_title='Count of Students')
+    return add_cell_targets(fig, count_data, "Probation=%{x}<br>English=%{y}<br>"
+                                             "Students=%{customdata}<extra></extra>")
+
+
+# ---------------------------------------------------------
+# Factor Ranking
+# ---------------------------------------------------------
+def plot_factor_importance(ranking, target, top=15):
+    table = ranking['rankings'][target].head(top).iloc[::-1].reset_index(names='Factor')
+    fig = px.bar(
+        table,
+        x='permutation',
+        y='Factor',
+        color='kind',
+        orientation='h',
+        title=f"Permutation Importance for {target.replace('_', ' ')} (top {top})",
+        labels={'permutation': 'Held-out R² lost when shuffled', 'kind': 'Factor type'},
+        hover_data={'correlation': ':.3f', 'mutual_info': ':.3f', 'permutation': ':.4f'},
+        height=550
+    )
+    fig.update_layout(yaxis_title='', yaxis={'categoryorder': 'array', 'categoryarray': table['Factor']})
+    return fig
+
+
+def plot_factor_correlations(ranking):
+    corr = ranking['correlations']
+    fig = px.imshow(
+        corr,
+        color_continuous_scale='RdBu_r',
+        zmin=-1, zmax=1,
+        text_auto='.2f',
+        title='Correlation Matrix of Numeric Factors and Outcomes',
+        height=750
+    )
+    fig.update_traces(textfont_size=8)
+    return fig
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import streamlit as st
+
+# =========================================================
+# Dataset Location
+# =========================================================
+# The dataset ships with the repository, so the dashboard can start without
+# any network access. Set ACADEMIC_DATA_PATH to point at another export.
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_DATA_PATH = ROOT_DIR / "new_dataset_academic_performance (1).csv"
+DATA_PATH = Path(os.environ.get("ACADEMIC_DATA_PATH", DEFAULT_DATA_PATH))
+
+# Every *.csv in this directory (one per campus or intake) is offered in the
+# sidebar next to the default dataset.
+DATASET_DIR = os.environ.get("ACADEMIC_DATASET_DIR")
+
+# Session-state keys holding the chosen datasets across pages.
+STATE_KEY = 'dataset'
+COMPARE_STATE_KEY = 'compare_dataset'
+NO_COMPARISON = "None"
+
+
+def available_datasets():
+    """Label -> path for every dataset the dashboard can show, default first."""
+    datasets = {DATA_PATH.stem: DATA_PATH}
+    if DATASET_DIR:
+        for path in sorted(Path(DATASET_DIR).glob('*.csv')):
+            if path.resolve() != DATA_PATH.resolve():
+                datasets.setdefault(path.stem, path)
+    return datasets
+
+
+def _choice(key, options):
+    # A widget value from the rerun its change triggered wins over the copy
+    # kept for navigation, which is only updated when the sidebar renders.
+    value = st.session_state.get(f"_{key}", st.session_state.get(key))
+    return value if value in options else None
+
+
+def selected_dataset():
+    """Path of the dataset chosen in this session (the default before any choice)."""
+    datasets = available_datasets()
+    return datasets.get(_choice(STATE_KEY, datasets), DATA_PATH)
+
+
+def selected_comparison():
+    """Path of the dataset chosen for comparison, or None."""
+    datasets = available_datasets()
+    label = _choice(COMPARE_STATE_KEY, datasets)
+    if label is None or datasets[label] == selected_dataset():
+        return None
+    return datasets[label]
+
+
+def render_dataset_selector():
+    """Draw the dataset and comparison pickers when there is more than one dataset.
+
+    Like the filters, the choices are copied out of the widget keys so they
+    survive navigation between pages.
+    """
+    datasets = available_datasets()
+    if len(datasets) < 2:
+        return
+
+    labels = list(datasets)
+    st.sidebar.header("Dataset")
+    current = _choice(STATE_KEY, datasets) or labels[0]
+    st.session_state[STATE_KEY] = st.sidebar.selectbox(
+        "Dataset", labels, index=labels.index(current), key=f"_{STATE_KEY}"
+    )
+
+    others = [NO_COMPARISON] + [label for label in labels if label != st.session_state[STATE_KEY]]
+    current = _choice(COMPARE_STATE_KEY, others) or NO_COMPARISON
+    st.session_state[COMPARE_STATE_KEY] = st.sidebar.selectbox(
+        "Compare with", others, index=others.index(current), key=f"_{COMPARE_STATE_KEY}"
+    )
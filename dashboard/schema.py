@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# Category Orderings
+# =========================================================
+AGE_GROUP_ORDER = ['18-20', '21-22', '23-24', '25+']
+ENGLISH_ORDER = ['Basic', 'Intermediate', 'Advance']
+INCOME_GROUP_ORDER = ['<50K', '50K-100K', '100K-200K', '>200K']
+
+# Bin edges for the derived group columns. Age bins are right-closed
+# (20 -> '18-20'); income bins are left-closed (50,000 -> '50K-100K').
+AGE_GROUP_BINS = [-np.inf, 20, 22, 24, np.inf]
+INCOME_GROUP_BINS = [-np.inf, 50_000, 100_000, 200_000, np.inf]
+
+# Yes/No survey answers are stored as booleans; charts map them back to labels.
+YES_NO_LABELS = {True: 'Yes', False: 'No'}
+
+# =========================================================
+# Column Schema
+# =========================================================
+# Each column maps to the smallest representation that holds its values:
+#   'bool'              Yes/No flags
+#   'int8' / 'int16'    small whole numbers (range-checked before casting)
+#   'float32'           measurements that only carry a few decimals
+#   'category'          repeated strings with low cardinality
+#   [values...]         ordered categorical with the given ordering
+SCHEMA = {
+    'Admission_Year': 'int16',
+    'Gender': 'category',
+    'Age': 'int8',
+    'HSC_Passing_Year': 'float32',
+    'Program': 'category',
+    'Semester': 'int8',
+    'Meritorious_Scholarship': 'bool',
+    'Use_Transport': 'bool',
+    'Daily_Study_Hours': 'int8',
+    'Study_Seats': 'int8',
+    'Learning_Mode': 'category',
+    'Use_Smartphone': 'bool',
+    'Has_PC': 'bool',
+    'Daily_Social_Media_Hours': 'int8',
+    'English_Proficiency': ENGLISH_ORDER,
+    'Attendance_Pct': 'int8',
+    'Fell_Probation': 'bool',
+    'Got_Suspension': 'bool',
+    'Attends_Consultancy': 'bool',
+    'Skills': 'category',
+    'Daily_Skill_Dev_Hours': 'int8',
+    'Interested_Area': 'category',
+    'Relationship_Status': 'category',
+    'CoCurriculum_Activities': 'bool',
+    'Living_With': 'category',
+    'Health_Issues': 'bool',
+    'Previous_SGPA': 'float32',
+    'Physical_Disabilities': 'bool',
+    'Current_CGPA': 'float32',
+    'Completed_Credits': 'float32',
+    'Monthly_Family_Income': 'float32',
+    'Income_Group': INCOME_GROUP_ORDER,
+    'Age_Group': AGE_GROUP_ORDER,
+}
+
+YES_NO_COLUMNS = [col for col, kind in SCHEMA.items() if kind == 'bool']
+
+
+class SchemaError(ValueError):
+    """Raised when the dataset does not fit the declared column schema."""
+
+
+def yes_no(series):
+    """Map a boolean flag column back to 'Yes'/'No' labels for display."""
+    return series.map(YES_NO_LABELS)
+
+
+def derive_age_group(age):
+    """Age_Group label for each Age value."""
+    return pd.cut(age, AGE_GROUP_BINS, labels=AGE_GROUP_ORDER, right=True)
+
+
+def derive_income_group(income):
+    """Income_Group label for each Monthly_Family_Income value."""
+    return pd.cut(income, INCOME_GROUP_BINS, labels=INCOME_GROUP_ORDER, right=False)
+
+
+# Columns computed from another column when an export does not include them.
+DERIVED_COLUMNS = {
+    'Age_Group': ('Age', derive_age_group),
+    'Income_Group': ('Monthly_Family_Income', derive_income_group),
+}
+
+
+def derive_columns(df):
+    """Add any missing derived group columns from their source columns."""
+    for col, (base, derive) in DERIVED_COLUMNS.items():
+        if col not in df.columns and base in df.columns:
+            df[col] = derive(pd.to_numeric(df[base], errors='coerce'))
+    return df
+
+
+def memory_mb(df):
+    """Deep memory footprint of a frame in megabytes."""
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def _to_bool(series, col):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    normalized = series.astype(str).str.strip().str.lower()
+    unknown = ~normalized.isin(['yes', 'no'])
+    if unknown.any():
+        raise SchemaError(f"{col}: expected Yes/No, found {sorted(series[unknown].astype(str).unique())[:5]}")
+    return normalized == 'yes'
+
+
+def _to_int(series, col, dtype):
+    if series.isna().any():
+        raise SchemaError(f"{col}: missing values cannot be stored as {dtype}")
+    info = np.iinfo(dtype)
+    if series.min() < info.min or series.max() > info.max:
+        raise SchemaError(f"{col}: values outside {dtype} range [{info.min}, {info.max}]")
+    return series.astype(dtype)
+
+
+def _to_ordered(series, col, categories):
+    result = pd.Categorical(series, categories=categories, ordered=True)
+    unknown = pd.isna(result) & series.notna().to_numpy()
+    if unknown.any():
+        raise SchemaError(f"{col}: unexpected categories {sorted(series[unknown].astype(str).unique())[:5]}")
+    return result
+
+
+def apply_schema(df):
+    """Cast every declared column to its compact dtype, validating as it goes.
+
+    Derived group columns absent from the frame are computed first; other
+    missing columns raise SchemaError and undeclared columns are left
+    untouched. Memory use before and after, in MB, is kept in
+    df.attrs['memory_mb'].
+    """
+    df = derive_columns(df)
+    missing = [col for col in SCHEMA if col not in df.columns]
+    if missing:
+        raise SchemaError(f"Dataset is missing required columns: {missing}")
+
+    before = memory_mb(df)
+    for col, kind in SCHEMA.items():
+        if isinstance(kind, list):
+            df[col] = _to_ordered(df[col], col, kind)
+        elif kind == 'bool':
+            df[col] = _to_bool(df[col], col)
+        elif kind in ('int8', 'int16'):
+            df[col] = _to_int(df[col], col, kind)
+        else:
+            df[col] = df[col].astype(kind)
+    after = memory_mb(df)
+
+    df.attrs['memory_mb'] = {'before': round(float(before), 3), 'after': round(float(after), 3)}
+    return df
@@ -0,0 +1,312 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import streamlit as st
+from scipy import stats as sps
+
+from dashboard.instrument import instrumented
+
+# =========================================================
+# Bootstrap Settings
+# =========================================================
+N_RESAMPLES = int(os.environ.get("BOOTSTRAP_RESAMPLES", 10_000))
+BOOTSTRAP_WORKERS = int(os.environ.get("BOOTSTRAP_WORKERS", os.cpu_count() or 1))
+# From this many rows on, confidence intervals are analytic (Welch for a
+# mean difference, Fisher z for a correlation) instead of bootstrapped; at
+# that size both agree to the reported precision, and resampling would cost
+# seconds per test before the summary could be shown.
+ANALYTIC_MIN_ROWS = int(os.environ.get("ANALYTIC_MIN_ROWS", 10_000))
+# A sample with at most 1/MULTINOMIAL_RATIO as many distinct rows as rows is
+# resampled by drawing multinomial counts over its distinct rows instead of
+# row indices (CGPA has a few hundred distinct values). A count costs about
+# as much as this many index draws.
+MULTINOMIAL_RATIO = 16
+# Resampled values held in memory at once per worker (rows x sample size).
+BATCH_ELEMENTS = 5_000_000
+# Below this much total work the bootstrap runs in-process; starting worker
+# processes would cost more than it saves.
+PARALLEL_MIN_ELEMENTS = 20_000_000
+SIGNIFICANCE = 0.05
+
+
+# =========================================================
+# Vectorized Bootstrap
+# =========================================================
+def _resample_set(columns):
+    """(columns, counts, n) of one sample, reduced to its distinct rows when cheaper.
+
+    `counts` is None when the rows are resampled by index.
+    """
+    n = len(columns[0])
+    if len(columns) == 1:
+        uniques, counts = np.unique(columns[0], return_counts=True)
+        uniques = uniques[None, :]
+    else:
+        uniques, counts = np.unique(np.column_stack(columns), axis=0, return_counts=True)
+        uniques = uniques.T
+    if len(counts) * MULTINOMIAL_RATIO <= n:
+        return list(uniques), counts, n
+    return list(columns), None, n
+
+
+def _resample_cost(sets):
+    return sum(len(columns) * (n if counts is None else len(counts)) for columns, counts, n in sets)
+
+
+def _prepare(kind, arrays):
+    """Resample sets for a statistic: the per-row columns whose sums it is computed from."""
+    if kind == 'mean_diff':
+        return [_resample_set([a]) for a in arrays]
+    if kind == 'corr':
+        # Centered first, so the sums of products do not cancel.
+        (x, y), counts, n = _resample_set([a - a.mean() for a in arrays])
+        return [([x, y, x * x, y * y, x * y], counts, n)]
+    raise ValueError(f"Unknown bootstrap statistic: {kind}")
+
+
+def _resample_sums(rng, columns, counts, n, rows):
+    """Column sums over `rows` resamples of n rows, as a (rows, columns) array."""
+    if counts is None:
+        idx = rng.integers(0, n, size=(rows, n))
+        return np.column_stack([column[idx].sum(axis=1) for column in columns])
+    draws = rng.multinomial(n, counts / n, size=rows)
+    return draws @ np.column_stack(columns)
+
+
+def _batch_statistic(kind, sets, rng, rows):
+    """Statistic for `rows` resamples, from the resampled column sums."""
+    sums = [_resample_sums(rng, *s, rows) for s in sets]
+    if kind == 'mean_diff':
+        (_, _, na), (_, _, nb) = sets
+        return sums[0][:, 0] / na - sums[1][:, 0] / nb
+    if kind == 'corr':
+        n = sets[0][2]
+        sx, sy, sxx, syy, sxy = sums[0].T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+    raise ValueError(f"Unknown bootstrap statistic: {kind}")
+
+
+def _bootstrap_chunk(kind, sets, n_resamples, seed):
+    """Worker entry point: run `n_resamples` resamples in memory-bounded batches."""
+    rng = np.random.default_rng(seed)
+    batch = max(1, BATCH_ELEMENTS // max(_resample_cost(sets), 1))
+    out = np.empty(n_resamples)
+    for start in range(0, n_resamples, batch):
+        rows = min(batch, n_resamples - start)
+        out[start:start + rows] = _batch_statistic(kind, sets, rng, rows)
+    return out
+
+
+def bootstrap(kind, arrays, n_resamples=N_RESAMPLES, seed=0, workers=BOOTSTRAP_WORKERS):
+    """Bootstrap distribution of a statistic.
+
+    Each resample is reduced to the column sums the statistic needs: drawn
+    as multinomial counts over the distinct rows of a sample when it has
+    few of them, and as row index matrices otherwise. Large jobs are split
+    into one chunk per worker process, each with an independent seed stream
+    and its own copy of the data.
+    """
+    sets = _prepare(kind, [np.asarray(a, dtype='float64') for a in arrays])
+    total = n_resamples * _resample_cost(sets)
+    seeds = np.random.SeedSequence(seed).spawn(max(workers, 1))
+    if workers <= 1 or total < PARALLEL_MIN_ELEMENTS:
+        return _bootstrap_chunk(kind, sets, n_resamples, seeds[0])
+
+    sizes = [len(part) for part in np.array_split(np.arange(n_resamples), workers)]
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_bootstrap_chunk, kind, sets, size, s)
+            for size, s in zip(sizes, seeds) if size
+        ]
+        return np.concatenate([f.result() for f in futures])
+
+
+def percentile_interval(samples, confidence=0.95):
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(samples, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def welch_interval(a, b, confidence=0.95):
+    """Analytic CI of the mean difference a - b (Welch-Satterthwaite degrees of freedom)."""
+    va, vb = np.var(a, ddof=1) / len(a), np.var(b, ddof=1) / len(b)
+    se = np.sqrt(va + vb)
+    if se == 0:
+        return (float(a.mean() - b.mean()),) * 2
+    dof = (va + vb) ** 2 / (va ** 2 / (len(a) - 1) + vb ** 2 / (len(b) - 1))
+    half = sps.t.ppf(0.5 + confidence / 2, dof) * se
+    diff = a.mean() - b.mean()
+    return float(diff - half), float(diff + half)
+
+
+def fisher_interval(r, n, confidence=0.95):
+    """Analytic CI of Pearson's r through the Fisher z transform."""
+    half = sps.norm.ppf(0.5 + confidence / 2) / np.sqrt(n - 3)
+    z = np.arctanh(np.clip(r, -1 + 1e-12, 1 - 1e-12))
+    return float(np.tanh(z - half)), float(np.tanh(z + half))
+
+
+# =========================================================
+# Comparisons
+# =========================================================
+def cohens_d(a, b):
+    """Standardized mean difference using the pooled standard deviation."""
+    na, nb = len(a), len(b)
+    pooled = ((na - 1) * np.var(a, ddof=1) + (nb - 1) * np.var(b, ddof=1)) / (na + nb - 2)
+    return float((np.mean(a) - np.mean(b)) / np.sqrt(pooled)) if pooled > 0 else float('nan')
+
+
+def compare_groups(a, b, n_resamples=N_RESAMPLES, confidence=0.95, seed=0):
+    """Mean difference a - b with CI, Cohen's d, Welch t and Mann-Whitney U.
+
+    The CI is bootstrapped below ANALYTIC_MIN_ROWS students and Welch's
+    analytic interval from there on.
+    """
+    a = np.asarray(a, dtype='float64')
+    b = np.asarray(b, dtype='float64')
+    a, b = a[np.isfinite(a)], b[np.isfinite(b)]
+    if len(a) < 2 or len(b) < 2:
+        return None
+
+    if len(a) + len(b) >= ANALYTIC_MIN_ROWS:
+        ci_low, ci_high = welch_interval(a, b, confidence)
+    else:
+        ci_low, ci_high = percentile_interval(bootstrap('mean_diff', [a, b], n_resamples, seed), confidence)
+    t_stat, t_p = sps.ttest_ind(a, b, equal_var=False)
+    u_stat, u_p = sps.mannwhitneyu(a, b, alternative='two-sided')
+    return {
+        'n_a': len(a), 'n_b': len(b),
+        'mean_a': float(a.mean()), 'mean_b': float(b.mean()),
+        'diff': float(a.mean() - b.mean()),
+        'ci_low': ci_low, 'ci_high': ci_high, 'confidence': confidence,
+        'cohens_d': cohens_d(a, b),
+        't_stat': float(t_stat), 't_p': float(t_p),
+        'u_stat': float(u_stat), 'u_p': float(u_p),
+        'significant': bool(t_p < SIGNIFICANCE and u_p < SIGNIFICANCE),
+    }
+
+
+def correlation(x, y, n_resamples=N_RESAMPLES, confidence=0.95, seed=0):
+    """Pearson r with CI and p-value, plus Spearman's rho.
+
+    The CI is bootstrapped below ANALYTIC_MIN_ROWS students and from the
+    Fisher z transform from there on.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    if len(x) < 3:
+        return None
+
+    r, r_p = sps.pearsonr(x, y)
+    rho, rho_p = sps.spearmanr(x, y)
+    if len(x) >= ANALYTIC_MIN_ROWS:
+        ci_low, ci_high = fisher_interval(r, len(x), confidence)
+    else:
+        ci_low, ci_high = percentile_interval(bootstrap('corr', [x, y], n_resamples, seed), confidence)
+    return {
+        'n': len(x),
+        'r': float(r), 'r_p': float(r_p),
+        'ci_low': ci_low, 'ci_high': ci_high, 'confidence': confidence,
+        'spearman': float(rho), 'spearman_p': float(rho_p),
+        'significant': bool(r_p < SIGNIFICANCE),
+    }
+
+
+def split_by_flag(df, flag, metric='Current_CGPA', labels=(True, False)):
+    """Metric values for the two groups of a two-valued column."""
+    values = df[metric].to_numpy(dtype='float64')
+    column = df[flag].to_numpy()
+    return values[column == labels[0]], values[column == labels[1]]
+
+
+# =========================================================
+# Generated Summaries
+# =========================================================
+# Shown with every generated summary: metric cards, charts and tests all use
+# the values as recorded, so they agree with each other.
+RECORDED_VALUES_NOTE = (
+    "All figures on this page use the recorded values, outliers included (no clipping); medians and "
+    "Mann-Whitney tests are the least affected by a few extreme entries."
+)
+
+
+def _p(p):
+    return "p < 0.001" if p < 0.001 else f"p = {p:.3f}"
+
+
+def describe_difference(result, group_a, group_b, metric='CGPA'):
+    """One-sentence, numbers-included description of a group comparison."""
+    if result is None:
+        return f"Not enough students to compare {group_a} and {group_b}."
+    level = f"{result['confidence']:.0%}"
+    welch, ranks = result['t_p'] < SIGNIFICANCE, result['u_p'] < SIGNIFICANCE
+    if welch == ranks:
+        verdict = f"the gap {'is' if result['significant'] else 'is not'} statistically significant"
+    else:
+        # Means and ranks disagree, typically because a few extreme values
+        # move the means.
+        verdict = (f"the gap is not clearly significant: only the {'Welch' if welch else 'Mann-Whitney'} "
+                   "test finds it significant")
+    return (
+        f"{group_a} average **{result['mean_a']:.2f}** vs. **{result['mean_b']:.2f}** {metric} for {group_b} "
+        f"(difference **{result['diff']:+.2f}**, {level} CI {result['ci_low']:+.2f} to {result['ci_high']:+.2f}; "
+        f"Cohen's d = {result['cohens_d']:.2f}; Welch {_p(result['t_p'])}, Mann-Whitney {_p(result['u_p'])}), "
+        f"so {verdict}."
+    )
+
+
+def describe_correlation(result, x_label, y_label):
+    """One-sentence description of a correlation and its uncertainty."""
+    if result is None:
+        return f"Not enough students to correlate {x_label} and {y_label}."
+    strength = abs(result['r'])
+    word = 'strong' if strength >= 0.5 else 'moderate' if strength >= 0.3 else 'weak' if strength >= 0.1 else 'negligible'
+    direction = 'positive' if result['r'] > 0 else 'negative'
+    level = f"{result['confidence']:.0%}"
+    return (
+        f"The correlation between {x_label} and {y_label} is {word} and {direction}: "
+        f"**r = {result['r']:.2f}** ({level} CI {result['ci_low']:.2f} to {result['ci_high']:.2f}, {_p(result['r_p'])}; "
+        f"Spearman ρ = {result['spearman']:.2f})."
+    )
+
+
+def describe_extremes(means, label, metric='CGPA', unit=''):
+    """Which group of a per-group mean Series is highest and which lowest."""
+    means = means.dropna()
+    if len(means) < 2:
+        return f"Not enough groups of {label} to compare."
+    high, low = means.idxmax(), means.idxmin()
+    return (
+        f"Average {metric} is highest for {label} **{high}** ({means[high]:.2f}{unit}) "
+        f"and lowest for {label} **{low}** ({means[low]:.2f}{unit})."
+    )
+
+
+# =========================================================
+# Cached Entry Points
+# =========================================================
+@instrumented('stats')
+@st.cache_data(show_spinner="Running significance tests...")
+def compare_flag(view_key, _df, flag, metric='Current_CGPA'):
+    """compare_groups() for True vs. False of a flag, cached per view."""
+    return compare_groups(*split_by_flag(_df, flag, metric))
+
+
+@instrumented('stats')
+@st.cache_data(show_spinner="Running significance tests...")
+def compare_values(view_key, _df, column, value_a, value_b, metric='Current_CGPA'):
+    """compare_groups() for two values of a column, cached per view."""
+    return compare_groups(*split_by_flag(_df, column, metric, labels=(value_a, value_b)))
+
+
+@instrumented('stats')
+@st.cache_data(show_spinner="Bootstrapping correlation...")
+def correlate(view_key, _df, x, y):
+    """correlation() between two columns, cached per view."""
+    return correlation(_df[x].to_numpy(dtype='float64'), _df[y].to_numpy(dtype='float64'))
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# Upper bound on the memory held by loaded datasets and filtered views, in megabytes.
+DATASET_MEMORY_MB = float(os.environ.get("DATASET_MEMORY_MB", 1024))
+
+
+class FrameStore:
+    """Process-wide LRU store of loaded datasets and views, bounded by bytes.
+
+    Values expose an `nbytes` attribute. Every session asks the store for the
+    same key and gets the same object, so a dataset is held once per process
+    however many sessions use it. Loads of one key are serialized: sessions
+    arriving while a load runs wait for it instead of loading a second copy.
+    Least recently used entries are evicted once the total exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        size = int(value.nbytes)
+        with self._lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_load(self, key, load):
+        """Return the stored value for `key`, calling load() once on a miss."""
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                with self._lock:
+                    self.misses += 1
+                value = self.put(key, load())
+            else:
+                with self._lock:
+                    self.hits += 1
+        with self._lock:
+            self._loading.pop(key, None)
+        return value
+
+    def discard(self, match):
+        """Drop every entry whose key satisfies match(key)."""
+        with self._lock:
+            for key in [k for k in self.entries if match(k)]:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+@st.cache_resource
+def get_frame_store():
+    """The frame store shared by every page and session in this process."""
+    return FrameStore(max_bytes=int(DATASET_MEMORY_MB * 1e6))
@@ -0,0 +1,211 @@
+"""Schema-faithful synthetic cohorts for scale testing.
+
+Learns the distributions of the 33 student columns from a source CSV and
+streams out cohorts of any size in fixed-size chunks:
+
+    python -m dashboard.synthetic --rows 5000000 -o cohort.csv
+    python -m dashboard.synthetic --rows 5000000 -o cohort.parquet --format parquet
+
+Output uses the raw CSV representation (Yes/No strings, group labels), so it
+loads through the same schema and ingest path as real exports. The same seed
+and chunk size always produce the same rows.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.charts import ols_fit
+from dashboard.importance import numeric_values
+from dashboard.schema import DERIVED_COLUMNS
+
+DEFAULT_CHUNK_ROWS = 250_000
+
+# =========================================================
+# Model Structure
+# =========================================================
+# Each node draws its columns jointly from the source rows that share the
+# node's parent values (an empirical conditional distribution). Columns
+# within a node keep their joint relationship; parents carry relationships
+# across nodes, e.g. Fell_Probation depends on English_Proficiency.
+NODES = [
+    (['Admission_Year', 'Semester', 'Completed_Credits'], []),
+    (['Age'], ['Admission_Year']),
+    (['HSC_Passing_Year'], ['Admission_Year', 'Age']),
+    (['Gender'], []),
+    (['Program'], []),
+    (['Monthly_Family_Income'], []),
+    (['Meritorious_Scholarship'], ['Income_Group']),
+    (['English_Proficiency'], []),
+    (['Fell_Probation'], ['English_Proficiency']),
+    (['Got_Suspension', 'Attends_Consultancy'], ['Fell_Probation']),
+    (['Attendance_Pct'], []),
+    (['Daily_Study_Hours', 'Study_Seats'], []),
+    (['Daily_Social_Media_Hours'], []),
+    (['Learning_Mode', 'Has_PC'], []),
+    (['Use_Transport', 'Use_Smartphone', 'Living_With'], []),
+    (['Skills', 'Daily_Skill_Dev_Hours', 'Interested_Area'], []),
+    (['Relationship_Status'], ['Age_Group']),
+    (['CoCurriculum_Activities', 'Health_Issues', 'Physical_Disabilities'], []),
+]
+
+# Continuous columns drawn as a linear function of a parent plus a resampled
+# residual, which keeps their correlation with the parent.
+REGRESSIONS = [
+    ('Current_CGPA', 'Attendance_Pct'),
+    ('Previous_SGPA', 'Current_CGPA'),
+]
+
+
+class _GroupSampler:
+    """Draw child columns from source rows sharing the parents' values."""
+
+    def __init__(self, source, children, parents):
+        self.children = children
+        self.parents = parents
+        self.values = {c: source[c].to_numpy() for c in children}
+        self.n = len(source)
+        if not parents:
+            return
+        keys = pd.MultiIndex.from_frame(source[parents].astype(str))
+        codes, self.groups = pd.factorize(keys)
+        self.order = np.argsort(codes, kind='stable')
+        self.counts = np.bincount(codes, minlength=len(self.groups))
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+
+    def sample(self, frame, rng):
+        n = len(frame)
+        rows = rng.integers(0, self.n, size=n)
+        if self.parents:
+            keys = pd.MultiIndex.from_frame(frame[self.parents].astype(str))
+            group = self.groups.get_indexer(keys)
+            seen = group >= 0
+            g = group[seen]
+            offsets = (rng.random(seen.sum()) * self.counts[g]).astype(np.int64)
+            # Unseen parent combinations fall back to the marginal distribution.
+            rows[seen] = self.order[self.starts[g] + offsets]
+        for c in self.children:
+            frame[c] = self.values[c][rows]
+
+
+class _RegressionSampler:
+    """child = intercept + slope * parent + resampled residual.
+
+    Fitted on both columns clipped to the factor ranking's CLIP_QUANTILES,
+    so data-entry outliers (a CGPA of 310) neither bend the slope nor come
+    back as residuals.
+    """
+
+    def __init__(self, source, child, parent):
+        self.child, self.parent = child, parent
+        x = numeric_values(source[parent])
+        y = numeric_values(source[child])
+        self.slope, self.intercept, _ = ols_fit(x, y)
+        residuals = y - (self.intercept + self.slope * x)
+        self.residuals = residuals[np.isfinite(residuals)]
+        self.low, self.high = np.nanmin(y), np.nanmax(y)
+
+    def sample(self, frame, rng):
+        x = frame[self.parent].to_numpy(dtype='float64')
+        noise = self.residuals[rng.integers(0, len(self.residuals), size=len(x))]
+        y = np.clip(self.intercept + self.slope * x + noise, self.low, self.high)
+        frame[self.child] = np.round(y, 2)
+
+
+class CohortModel:
+    """Fitted generator for synthetic student cohorts."""
+
+    def __init__(self, columns, steps):
+        self.columns = columns
+        self.steps = steps
+
+    @classmethod
+    def fit(cls, source):
+        """Learn the node and regression distributions from a raw source frame."""
+        steps = []
+        placed = set()
+
+        def place_derived():
+            for col, (base, derive) in DERIVED_COLUMNS.items():
+                if col not in placed and base in placed:
+                    steps.append(('derive', col, base, derive))
+                    placed.add(col)
+
+        regressions = {child: parent for child, parent in REGRESSIONS}
+        for children, parents in NODES:
+            steps.append(('node', _GroupSampler(source, children, parents)))
+            placed.update(children)
+            place_derived()
+            for child, parent in list(regressions.items()):
+                if parent in placed:
+                    steps.append(('node', _RegressionSampler(source, child, parent)))
+                    placed.add(child)
+                    del regressions[child]
+                    place_derived()
+        return cls(list(source.columns), steps)
+
+    def sample(self, n_rows, rng):
+        """One chunk of synthetic rows in the source's column order."""
+        frame = pd.DataFrame(index=pd.RangeIndex(n_rows))
+        for step in self.steps:
+            if step[0] == 'node':
+                step[1].sample(frame, rng)
+            else:
+                _, col, base, derive = step
+                frame[col] = derive(frame[base]).astype(object)
+        return frame[self.columns]
+
+
+def iter_chunks(model, n_rows, chunk_rows=DEFAULT_CHUNK_ROWS, seed=0):
+    """Yield synthetic chunks; each chunk has its own seed stream for reproducibility."""
+    n_chunks = -(-n_rows // chunk_rows)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        size = min(chunk_rows, n_rows - i * chunk_rows)
+        yield model.sample(size, np.random.default_rng(child))
+
+
+def write_cohort(model, n_rows, output, fmt='csv', chunk_rows=DEFAULT_CHUNK_ROWS, seed=0):
+    """Stream a cohort to CSV, Parquet or Feather, holding one chunk in memory."""
+    output = Path(output)
+    writer = None
+    try:
+        for i, chunk in enumerate(iter_chunks(model, n_rows, chunk_rows, seed)):
+            if fmt == 'csv':
+                chunk.to_csv(output, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                continue
+            import pyarrow as pa
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                if fmt == 'parquet':
+                    import pyarrow.parquet as pq
+                    writer = pq.ParquetWriter(output, table.schema)
+                else:
+                    writer = pa.ipc.new_file(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output
+
+
+def main(argv=None):
+    from dashboard.data import DATA_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=str(DATA_PATH), help="CSV to learn distributions from")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    model = CohortModel.fit(pd.read_csv(args.source))
+    write_cohort(model, args.rows, args.output, args.format, args.chunk_rows, args.seed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Background warm-up of the shared dataset, figure and test caches.
+
+The first script run in a process starts one daemon thread (start_warmup()
+is cached as a resource). The thread loads the default dataset into the
+frame store, builds every default-view figure of the pages into the figure
+cache and runs the significance tests behind their summaries. It then polls
+the data files: a changed file is re-warmed as soon as it is seen, and the
+whole warm-up is repeated every WARMUP_INTERVAL_S seconds so entries evicted
+from the LRU caches come back before a user needs them.
+
+Running ``python -m dashboard.warmup`` ingests the snapshots of every
+dataset ahead of a deploy, so the server never parses a CSV on start.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from dashboard.data import dataset_fingerprint, dataset_version, load_frame, warm_dataset
+from dashboard.figures import get_figure_cache
+from dashboard.importance import factor_ranking
+from dashboard.plots import (
+    plot_cgpa_by_income_scholarship, plot_cgpa_by_probation_consultancy, plot_cgpa_heatmap,
+    plot_cgpa_vs_attendance, plot_cgpa_vs_gender, plot_cgpa_vs_social_media,
+    plot_english_probation_heatmap, plot_pc_vs_learning_mode, plot_skill_dev_by_semester,
+)
+from dashboard.registry import DATA_PATH, available_datasets
+from dashboard.stats import compare_flag, compare_values, correlate
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# Settings
+# =========================================================
+WARMUP = os.environ.get("DASHBOARD_WARMUP", "1") == "1"
+# Seconds between checks of the data files for a new version.
+WARMUP_POLL_S = float(os.environ.get("DASHBOARD_WARMUP_POLL", 30))
+# Seconds between full re-warms of an unchanged dataset.
+WARMUP_INTERVAL_S = float(os.environ.get("DASHBOARD_WARMUP_INTERVAL", 900))
+
+# Every figure the pages show for the unfiltered view, with the part of the
+# view it is built from.
+DEFAULT_FIGURES = [
+    (plot_cgpa_vs_gender, 'frame'),
+    (plot_cgpa_heatmap, 'cube'),
+    (plot_cgpa_by_income_scholarship, 'cube'),
+    (plot_cgpa_vs_social_media, 'frame'),
+    (plot_cgpa_vs_attendance, 'frame'),
+    (plot_pc_vs_learning_mode, 'cube'),
+    (plot_cgpa_by_probation_consultancy, 'frame'),
+    (plot_skill_dev_by_semester, 'cube'),
+    (plot_english_probation_heatmap, 'cube'),
+]
+
+# The significance tests and factor ranking run by the pages, as (function, args, kwargs)
+# following the (view key, frame) arguments.
+DEFAULT_TESTS = [
+    (compare_values, ('Gender', 'Male', 'Female'), {}),
+    (compare_flag, ('Meritorious_Scholarship',), {}),
+    (correlate, ('Attendance_Pct', 'Current_CGPA'), {}),
+    (correlate, ('Daily_Study_Hours', 'Current_CGPA'), {}),
+    (correlate, ('Daily_Social_Media_Hours', 'Current_CGPA'), {}),
+    (compare_flag, ('Has_PC',), {}),
+    (compare_flag, ('Attends_Consultancy',), {}),
+    (compare_flag, ('Attends_Consultancy',), {'metric': 'Fell_Probation'}),
+    (factor_ranking, (), {}),
+]
+
+
+def warm_default_view(path=None):
+    """Load a dataset and build the default view's figures and tests."""
+    path = str(path or DATA_PATH)
+    dataset = warm_dataset(path)
+    view_key = (dataset_fingerprint(path), ())
+    sources = {'frame': dataset.frame, 'cube': dataset.cube}
+    cache = get_figure_cache()
+    for plot_fn, source in DEFAULT_FIGURES:
+        cache.figure(plot_fn, sources[source], view_key)
+    for test, args, kwargs in DEFAULT_TESTS:
+        test(view_key, dataset.frame, *args, **kwargs)
+    return dataset
+
+
+class Warmer:
+    """Daemon thread keeping the default dataset's caches warm.
+
+    Other datasets in the registry only get their snapshots ingested, so a
+    switch to them reads a snapshot instead of parsing the CSV, without
+    holding every dataset in memory.
+    """
+
+    def __init__(self, poll=WARMUP_POLL_S, interval=WARMUP_INTERVAL_S):
+        self.poll = poll
+        self.interval = interval
+        self.versions = {}
+        self.runs = 0
+        self.last_run = None
+        self.last_seconds = None
+        self.last_error = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='dashboard-warmup', daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self):
+        while True:
+            self.check()
+            time.sleep(self.poll)
+
+    def _due(self, path):
+        version = dataset_version(path)
+        if version is None:
+            return None
+        if self.versions.get(path) != version or path == str(DATA_PATH) and self._stale():
+            return version
+        return None
+
+    def _stale(self):
+        return self.last_run is None or time.time() - self.last_run >= self.interval
+
+    def check(self):
+        """Warm every dataset whose file changed, and the default one when stale."""
+        for path in map(str, available_datasets().values()):
+            version = self._due(path)
+            if version is None:
+                continue
+            start = time.perf_counter()
+            try:
+                if path == str(DATA_PATH):
+                    warm_default_view(path)
+                else:
+                    load_frame(path)
+            except Exception as e:
+                self.last_error = f"{Path(path).name}: {e}"
+                logger.warning("Warm-up of %s failed: %s", path, e)
+            else:
+                logger.info("Warmed %s in %.1f s", path, time.perf_counter() - start)
+            # A failing file is retried when it changes or at the next
+            # interval, not on every poll.
+            self.versions[path] = version
+            if path == str(DATA_PATH):
+                self.runs += 1
+                self.last_run = time.time()
+                self.last_seconds = time.perf_counter() - start
+
+    def stats(self):
+        return {
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'last_seconds': self.last_seconds,
+            'last_error': self.last_error,
+        }
+
+
+@st.cache_resource
+def start_warmup():
+    """Start the process-wide warm-up thread (once); None when disabled."""
+    if not WARMUP:
+        return None
+    return Warmer().start()
+
+
+if __name__ == '__main__':
+    for label, path in available_datasets().items():
+        start = time.perf_counter()
+        rows = len(load_frame(path))
+        print(f"{label}: {rows:,} rows ready in {time.perf_counter() - start:.1f} s")
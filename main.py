@@ -1,10 +1,15 @@
 import streamlit as st
 
+from dashboard.warmup import start_warmup
+
 # Set the page title and layout
 st.set_page_config(
     page_title="Academic Performance Dashboard",
     layout="wide"
 )
+# Load the dataset and build the page figures in the background, so the
+# first visit to an objective page finds them ready.
+start_warmup()
 
 # Homepage content
 st.title("🎓 Academic Performance Dashboard")
@@ -15,6 +20,7 @@ Use the **sidebar** to navigate between different objectives:
 - Objective 1: Core Demographics  
 - Objective 2: Learning Factors  
 - Objective 3: Advanced Trends  
+- Factor Ranking: every factor ranked against CGPA and probation  
 
 Each page contains interactive visualizations for analysis.
 """)
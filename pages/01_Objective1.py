@@ -1,6 +1,12 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from dashboard.compare import render_comparison
+from dashboard.data import comparison_view, load_data, sidebar_view
+from dashboard.figures import figure_section
+from dashboard.instrument import begin_rerun, end_rerun
+from dashboard.plots import plot_cgpa_by_income_scholarship, plot_cgpa_heatmap, plot_cgpa_vs_gender
+from dashboard.stats import RECORDED_VALUES_NOTE, compare_flag, compare_values, describe_difference, describe_extremes
+from dashboard.warmup import start_warmup
 
 # =========================================================
 # Academic Performance Visualization Dashboard
@@ -12,27 +18,28 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+begin_rerun("Objective 1")
+start_warmup()
 
 # =========================================================
 # Load Dataset
 # =========================================================
-@st.cache_data
-def load_data():
-    """Load academic performance dataset from GitHub."""
-    try:
-        URL = "https://raw.githubusercontent.com/Wanioooo/assignmentSV1/refs/heads/main/new_dataset_academic_performance%20(1).csv"
-        df = pd.read_csv(URL)
-        df['Age_Group'] = pd.Categorical(df['Age_Group'], categories=['18-20', '21-22', '23-24', '25+'], ordered=True)
-        df['Income_Group'] = df['Income_Group'].astype(str)
-        return df
-    except Exception as e:
-        st.error(f"Error loading dataset: {e}")
-        return pd.DataFrame()
-
 df = load_data()
 
 if df.empty or 'Current_CGPA' not in df.columns:
     st.warning("Dataset could not be loaded or is missing required columns.")
+    end_rerun()
+    st.stop()
+
+# =========================================================
+# Global Filters
+# =========================================================
+view = sidebar_view()
+df, cube, view_key = view.frame, view.cube, view.key
+
+if df.empty:
+    st.warning("No students match the current filters.")
+    end_rerun()
     st.stop()
 
 # =========================================================
@@ -41,19 +48,21 @@ if df.empty or 'Current_CGPA' not in df.columns:
 st.header("Objective 1: Socio-economic and Demographic Influence")
 st.markdown("🎓 **Goal:** Analyze the influence of socio-economic and demographic factors on student academic performance (Current CGPA).")
 
+# =========================================================
+# Dataset Comparison
+# =========================================================
+compare = comparison_view()
+if compare is not None:
+    render_comparison(view, compare)
+
 # =========================================================
 # Summary Box (Top Section)
 # =========================================================
 st.subheader("📘 Summary Box: Socio-economic and Demographic Influence")
 
-with st.container(border=True):
-    st.markdown("""
-    **Summary:**  
-    This analysis explores the impact of **gender**, **age/admission year**, and **socio-economic status** on **Current CGPA**.  
-    The visualizations show that while average CGPA is similar between genders, the **Meritorious Scholarship** status is a powerful positive differentiator across all income groups.  
-    The heatmap reveals a potential academic challenge among older students (25+), as they tend to have slightly lower average CGPAs.  
-    Overall, financial aid tied to merit appears to be a stronger predictor of academic performance than gender or income group alone.
-    """)
+# Filled in once the significance tests below have run, so the metrics show
+# without waiting for them.
+summary_box = st.container(border=True)
 
 st.divider()
 
@@ -63,19 +72,20 @@ st.divider()
 st.subheader("Key Summary Metrics for Academic Performance")
 
 col1, col2, col3 = st.columns(3)
-col1.metric("Average CGPA", f"{df['Current_CGPA'].mean():.2f}")
+cgpa_stats = cube.overall('Current_CGPA')
+col1.metric("Average CGPA", f"{cgpa_stats['mean']:.2f}")
 col2.metric("Median CGPA", f"{df['Current_CGPA'].median():.2f}")
-col3.metric("Std. Deviation", f"{df['Current_CGPA'].std():.2f}")
+col3.metric("Std. Deviation", f"{cgpa_stats['std']:.2f}")
 
 st.divider()
 
 st.subheader("Average CGPA by Gender")
 
-gender_cgpa = df.groupby('Gender', as_index=False)['Current_CGPA'].mean()
+gender_cgpa = cube.mean(['Gender'], 'Current_CGPA')
 col_m, col_f = st.columns(2)
 
-male_avg = gender_cgpa.loc[gender_cgpa['Gender'] == 'Male', 'Current_CGPA'].squeeze() if 'Male' in gender_cgpa['Gender'].values else 0
-female_avg = gender_cgpa.loc[gender_cgpa['Gender'] == 'Female', 'Current_CGPA'].squeeze() if 'Female' in gender_cgpa['Gender'].values else 0
+male_avg = gender_cgpa.get('Male', 0)
+female_avg = gender_cgpa.get('Female', 0)
 
 col_m.info(f"**Male Average CGPA:** {male_avg:.2f}")
 col_f.info(f"**Female Average CGPA:** {female_avg:.2f}")
@@ -83,82 +93,72 @@ col_f.info(f"**Female Average CGPA:** {female_avg:.2f}")
 st.divider()
 
 # =========================================================
-# Visualization Functions
+# Statistical Tests
 # =========================================================
-def plot_cgpa_vs_gender(data):
-    fig = px.box(
-        data, x='Gender', y='Current_CGPA',
-        color='Gender',
-        title="CGPA Distribution by Gender",
-        color_discrete_map={'Male': 'blue', 'Female': 'red'},
-        height=450, range_y=[2.0, 4.0]
-    )
-    fig.update_layout(xaxis_title="Gender", yaxis_title="Current CGPA")
-    return fig
-
-def plot_cgpa_heatmap(data):
-    grouped = data.groupby(['Admission_Year', 'Age_Group'])['Current_CGPA'].mean().unstack()
-    fig = px.imshow(
-        grouped,
-        x=grouped.columns,
-        y=grouped.index.astype(str),
-        color_continuous_scale="YlGnBu",
-        text_auto=".2f",
-        title="Average CGPA by Admission Year and Age Group",
-        height=500
-    )
-    fig.update_layout(xaxis_title="Age Group", yaxis_title="Admission Year")
-    return fig
-
-def plot_cgpa_by_income_scholarship(data):
-    grouped = data.groupby(['Income_Group', 'Meritorious_Scholarship'])['Current_CGPA'].mean().reset_index()
-    fig = px.bar(
-        grouped,
-        x='Income_Group',
-        y='Current_CGPA',
-        color='Meritorious_Scholarship',
-        barmode='group',
-        title="Average CGPA by Family Income and Scholarship Status",
-        labels={'Current_CGPA': 'Average CGPA', 'Meritorious_Scholarship': 'Scholarship'},
-        color_discrete_map={'Yes': 'green', 'No': 'red'},
-        height=500
+gender_test = compare_values(view_key, df, 'Gender', 'Male', 'Female')
+scholarship_test = compare_flag(view_key, df, 'Meritorious_Scholarship')
+gender_text = describe_difference(gender_test, "Male students", "female students")
+scholarship_text = describe_difference(scholarship_test, "Scholarship holders", "non-holders")
+
+scholarship_leads = (
+    scholarship_test is not None and scholarship_test['significant'] and scholarship_test['diff'] > 0
+    and (gender_test is None or abs(scholarship_test['cohens_d']) > abs(gender_test['cohens_d']))
+)
+if scholarship_leads:
+    overall_text = "Overall, financial aid tied to merit appears to be a stronger predictor of academic performance than gender."
+else:
+    overall_text = "Overall, neither scholarship status nor gender shows a clear, statistically significant CGPA advantage for the selected students."
+
+# --- Age and admission year, from the heatmap's cells ---
+age_cgpa = cube.mean(['Age_Group'], 'Current_CGPA')
+age_text = describe_extremes(age_cgpa, "age group")
+cells = cube.stats(['Admission_Year', 'Age_Group'], 'Current_CGPA')
+cells = cells[cells['count'] > 0]
+heatmap_text = ""
+if len(cells) > 1:
+    year, age = cells['mean'].idxmin()
+    lowest = cells.loc[(year, age)]
+    heatmap_text = (
+        f"The lowest heatmap cell is age group **{age}** admitted in **{year}** "
+        f"({lowest['mean']:.2f} over {int(lowest['count']):,} students, against {cgpa_stats['mean']:.2f} overall)."
     )
-    fig.update_layout(xaxis_title="Family Income Group", yaxis_title="Average CGPA")
-    return fig
+oldest_lowest = len(age_cgpa.dropna()) > 1 and age_cgpa.dropna().idxmin() == age_cgpa.dropna().index[-1]
+
+with summary_box:
+    st.markdown(f"""
+    **Summary:**  
+    This analysis explores the impact of **gender**, **age/admission year**, and **socio-economic status** on **Current CGPA**.  
+    **Gender:** {gender_text}  
+    **Meritorious Scholarship:** {scholarship_text}  
+    **Age:** {age_text}  
+    {overall_text}  
+    _{RECORDED_VALUES_NOTE}_
+    """)
 
 # =========================================================
 # Visualizations + Interpretations
 # =========================================================
-st.subheader("Visualization 1: CGPA Distribution by Gender")
-st.plotly_chart(plot_cgpa_vs_gender(df), use_container_width=True)
-st.markdown("""
+# Each section is only built while it is expanded; clicking a heatmap cell
+# or bar lists the students behind it.
+figure_section("Visualization 1: CGPA Distribution by Gender", 'obj1_gender', plot_cgpa_vs_gender, df, view_key, f"""
 **Interpretation:**  
-* **Gender Parity:** The box plot and average metrics suggest that there is **no significant academic gap based on gender**.  
-  Both male and female CGPA distributions are highly concentrated, indicating similar levels of academic success.
+* **Gender Parity:** {gender_text}  
+  The box plot shows how concentrated the male and female CGPA distributions are around these averages.
 """)
 
-st.divider()
-
-st.subheader("Visualization 2: Heatmap of Average CGPA by Admission Year and Age Group")
-st.plotly_chart(plot_cgpa_heatmap(df), use_container_width=True)
-st.markdown("""
+figure_section("Visualization 2: Heatmap of Average CGPA by Admission Year and Age Group", 'obj1_heatmap', plot_cgpa_heatmap, cube, view_key, f"""
 **Interpretation:**  
-* **Age and Admission Year:** The **Heatmap** shows that the **Age Group (25+)** is associated with lower average CGPAs, 
-  particularly for those admitted more recently (2020–2021).  
-  This pattern might be due to non-traditional students balancing studies with external commitments (work, family), 
-  which can affect time dedicated to coursework.
-""")
-
-st.divider()
+* **Age and Admission Year:** {age_text} {heatmap_text}  
+  {"A lower average for the oldest students might reflect non-traditional students balancing studies with external commitments (work, family)." if oldest_lowest else ""}
+""", drilldown=view)
 
-st.subheader("Visualization 3: CGPA by Family Income Group and Scholarship Status")
-st.plotly_chart(plot_cgpa_by_income_scholarship(df), use_container_width=True)
-st.markdown("""
+figure_section("Visualization 3: CGPA by Family Income Group and Scholarship Status", 'obj1_income', plot_cgpa_by_income_scholarship, cube, view_key, f"""
 **Interpretation:**  
-* **Scholarship as a Predictor:** The grouped bar plot confirms a powerful finding — students receiving a **Meritorious Scholarship** 
-  maintain substantially higher CGPAs than their non-scholarship counterparts, *regardless of their family income group*.  
-  This suggests that the selection criteria for the scholarship (which is merit-based) effectively identifies students with 
-  the highest potential for academic excellence.
-""")
+* **Scholarship as a Predictor:** {scholarship_text}  
+  The grouped bar plot breaks this comparison down by *family income group*.  
+  {"This suggests that the selection criteria for the scholarship (which is merit-based) effectively identifies students with the highest potential for academic excellence." if scholarship_leads else "The scholarship gap is not large or consistent enough here to single out merit-based selection as the driver."}
+""", drilldown=view)
 
 st.success("✅ Analysis Completed Successfully")
+
+end_rerun()
@@ -1,30 +1,21 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
+
+from dashboard.compare import render_comparison
+from dashboard.data import comparison_view, load_data, sidebar_view
+from dashboard.figures import figure_section
+from dashboard.instrument import begin_rerun, end_rerun
+from dashboard.plots import plot_cgpa_vs_attendance, plot_cgpa_vs_social_media, plot_pc_vs_learning_mode
+from dashboard.stats import (
+    RECORDED_VALUES_NOTE, compare_flag, correlate, describe_correlation, describe_difference, describe_extremes,
+)
+from dashboard.warmup import start_warmup
 
 # --- Streamlit Page Config ---
 st.set_page_config(layout="wide")
+begin_rerun("Objective 2")
+start_warmup()
 
-# --- Load Data Function ---
-@st.cache_data
-def load_data():
-    try:
-        URL = "https://raw.githubusercontent.com/Wanioooo/assignmentSV1/refs/heads/main/new_dataset_academic_performance%20(1).csv"
-        df = pd.read_csv(URL)
-
-        # Categorical ordering
-        df['Age_Group'] = pd.Categorical(df['Age_Group'], categories=['18-20','21-22','23-24','25+'], ordered=True)
-        study_order = sorted(df['Daily_Study_Hours'].unique())
-        media_order = sorted(df['Daily_Social_Media_Hours'].unique())
-
-        df['Daily_Study_Hours'] = pd.Categorical(df['Daily_Study_Hours'], categories=study_order, ordered=True)
-        df['Daily_Social_Media_Hours'] = pd.Categorical(df['Daily_Social_Media_Hours'], categories=media_order, ordered=True)
-        return df
-    except Exception as e:
-        st.error(f"🚨 Error loading dataset: {e}")
-        return pd.DataFrame()
-
+# --- Load Data ---
 df = load_data()
 
 # --- Title and Description ---
@@ -34,21 +25,31 @@ st.markdown("🔍 Investigate the relationship between study habits and resource
 # --- Safety Check ---
 if df.empty or 'Current_CGPA' not in df.columns:
     st.warning("⚠️ Cannot run analysis — data failed to load properly.")
+    end_rerun()
+    st.stop()
+
+# --- Global Filters ---
+view = sidebar_view()
+df, cube, view_key = view.frame, view.cube, view.key
+
+if df.empty:
+    st.warning("⚠️ No students match the current filters.")
+    end_rerun()
     st.stop()
 
+# --- Dataset Comparison ---
+compare = comparison_view()
+if compare is not None:
+    render_comparison(view, compare)
+
 # ==============================
 # 🔹 SUMMARY SECTION (TOP BOX)
 # ==============================
 st.header("📊 Summary of Findings", divider="blue")
 
-st.markdown("""
-**Summary:**
-This objective analyzes how **study habits** (study time, social media time, attendance) and **resources** (PC ownership) impact **Current CGPA**.  
-There is a clear **positive relationship** between **Daily Study Hours** and average CGPA, peaking in the 3–4 hour range.  
-Conversely, increased **Daily Social Media Hours** correlate with lower median CGPA and wider performance variation.  
-The scatter plot confirms a **strong positive correlation (~0.70)** between **Class Attendance Percentage** and CGPA.  
-Owning a **Personal Computer (PC)** is also associated with a reliably higher average CGPA, regardless of learning mode, showing that access to digital resources benefits academic outcomes.
-""")
+# Filled in once the significance tests below have run, so the metrics show
+# without waiting for them.
+summary_box = st.container()
 
 st.divider()
 
@@ -58,16 +59,16 @@ st.divider()
 st.header("Key Summary Metrics", divider="blue")
 
 col1, col2, col3 = st.columns(3)
-col1.metric("Overall Average CGPA", f"{df['Current_CGPA'].mean():.2f}")
-col2.metric("Average Attendance %", f"{df['Attendance_Pct'].mean():.1f}%")
+col1.metric("Overall Average CGPA", f"{cube.overall('Current_CGPA')['mean']:.2f}")
+col2.metric("Average Attendance %", f"{cube.overall('Attendance_Pct')['mean']:.1f}%")
 
-correlation = df['Attendance_Pct'].corr(df['Current_CGPA'])
+correlation = cube.corr('Attendance_Pct', 'Current_CGPA').iloc[0]
 col3.metric("Attendance vs. CGPA Correlation", f"{correlation:.2f}")
 
 st.subheader("CGPA by Study vs. Social Media Balance")
 
-study_cgpa = df.groupby('Daily_Study_Hours')['Current_CGPA'].mean().sort_values(ascending=False)
-social_cgpa = df.groupby('Daily_Social_Media_Hours')['Current_CGPA'].mean().sort_values(ascending=True)
+study_cgpa = cube.mean(['Daily_Study_Hours'], 'Current_CGPA').sort_values(ascending=False)
+social_cgpa = cube.mean(['Daily_Social_Media_Hours'], 'Current_CGPA').sort_values(ascending=True)
 
 col_study, col_social, col_pc = st.columns(3)
 with col_study:
@@ -78,91 +79,61 @@ with col_social:
     st.markdown("**Lowest CGPA Correlates with:**")
     st.metric(f"Avg. CGPA for {social_cgpa.index[0]} Social Media Hours", f"{social_cgpa.iloc[0]:.2f}")
 
-pc_data = df.groupby('Has_PC')['Current_CGPA'].mean()
-if 'Yes' in pc_data.index and 'No' in pc_data.index:
-    pc_diff = pc_data['Yes'] - pc_data['No']
+pc_data = cube.mean(['Has_PC'], 'Current_CGPA')
+if True in pc_data.index and False in pc_data.index:
+    pc_diff = pc_data[True] - pc_data[False]
     with col_pc:
         st.markdown("**Impact of PC Ownership:**")
         st.metric("CGPA Difference (PC Yes - No)", f"{pc_diff:.2f}", delta="Higher" if pc_diff > 0 else "Lower")
 
 st.divider()
 
-# ==============================
-# 🔹 VISUALIZATION FUNCTIONS
-# ==============================
-def plot_cgpa_vs_social_media(data):
-    fig = px.box(
-        data,
-        x='Daily_Social_Media_Hours',
-        y='Current_CGPA',
-        color='Daily_Social_Media_Hours',
-        title='Visualization 1: CGPA Distribution by Daily Social Media Hours',
-        height=550,
-        range_y=[2.0,4.0]
-    )
-    order_array = list(data['Daily_Social_Media_Hours'].cat.categories)
-    fig.update_layout(
-        xaxis={'categoryorder':'array','categoryarray':order_array},
-        xaxis_title='Daily Social Media Hours (Hours)',
-        yaxis_title='Current CGPA',
-        showlegend=False
-    )
-    return fig
-
-def plot_cgpa_vs_attendance(data):
-    fig = px.scatter(
-        data,
-        x='Attendance_Pct',
-        y='Current_CGPA',
-        trendline='ols',
-        title='Visualization 2: Current CGPA vs. Class Attendance Percentage',
-        height=500,
-        range_x=[0,100],
-        range_y=[2.0,4.0]
-    )
-    fig.update_layout(xaxis_title='Class Attendance (%)', yaxis_title='Current CGPA')
-    return fig
-
-def plot_pc_vs_learning_mode(data):
-    pc_mode_data = data.groupby(['Learning_Mode','Has_PC'])['Current_CGPA'].mean().reset_index()
-    fig = px.bar(
-        pc_mode_data,
-        x='Learning_Mode',
-        y='Current_CGPA',
-        color='Has_PC',
-        barmode='group',
-        title='Visualization 4: Average CGPA — PC Ownership vs. Learning Mode',
-        labels={'Current_CGPA':'Average CGPA','Has_PC':'Has Personal Computer?'},
-        height=500,
-        color_discrete_map={'Yes':'#E41A1C','No':'#377EB8'}
-    )
-    fig.update_layout(xaxis_title='Learning Mode', yaxis_title='Average Current CGPA')
-    return fig
+# --- Statistical Tests ---
+attendance_test = correlate(view_key, df, 'Attendance_Pct', 'Current_CGPA')
+pc_test = compare_flag(view_key, df, 'Has_PC')
+attendance_text = describe_correlation(attendance_test, "class attendance percentage", "CGPA")
+pc_text = describe_difference(pc_test, "Students with a PC", "students without one")
+study_text = " ".join([
+    describe_extremes(study_cgpa, "daily study hours of"),
+    describe_correlation(correlate(view_key, df, 'Daily_Study_Hours', 'Current_CGPA'), "daily study hours", "CGPA"),
+])
+social_text = " ".join([
+    describe_extremes(social_cgpa, "daily social media hours of"),
+    describe_correlation(correlate(view_key, df, 'Daily_Social_Media_Hours', 'Current_CGPA'),
+                         "daily social media hours", "CGPA"),
+])
+
+summary_box.markdown(f"""
+**Summary:**
+This objective analyzes how **study habits** (study time, social media time, attendance) and **resources** (PC ownership) impact **Current CGPA**.  
+**Daily Study Hours:** {study_text}  
+**Daily Social Media Hours:** {social_text}  
+**Class Attendance:** {attendance_text}  
+**Personal Computer (PC):** {pc_text}  
+_{RECORDED_VALUES_NOTE}_
+""")
 
 # ==============================
 # 🔹 VISUALIZATION DISPLAY + INTERPRETATION
 # ==============================
+# Each section is only built while it is expanded.
 
 # --- Visualization 1 ---
-st.subheader("Visualization 1: CGPA Distribution by Daily Social Media Hours")
-st.plotly_chart(plot_cgpa_vs_social_media(df), use_container_width=True)
-st.markdown("""
+figure_section("Visualization 1: CGPA Distribution by Daily Social Media Hours", 'obj2_social_media', plot_cgpa_vs_social_media, df, view_key, f"""
 💡 **Interpretation:**  
-Higher daily social media usage tends to lower the median CGPA and increase variability, suggesting it may distract from academic focus.
+{social_text} The box plots show how the median and spread of CGPA change with social media time.
 """)
 
 # --- Visualization 2 ---
-st.subheader("Visualization 2: Scatter Plot of Current CGPA vs. Class Attendance Percentage")
-st.plotly_chart(plot_cgpa_vs_attendance(df), use_container_width=True)
-st.markdown("""
+figure_section("Visualization 2: Scatter Plot of Current CGPA vs. Class Attendance Percentage", 'obj2_attendance', plot_cgpa_vs_attendance, df, view_key, f"""
 💡 **Interpretation:**  
-A strong positive correlation (~0.70) exists between attendance percentage and CGPA, confirming that consistent class participation boosts performance.
+{attendance_text}
 """)
 
 # --- Visualization 4 ---
-st.subheader("Visualization 3: Average CGPA — PC Ownership vs. Learning Mode")
-st.plotly_chart(plot_pc_vs_learning_mode(df), use_container_width=True)
-st.markdown("""
+figure_section("Visualization 3: Average CGPA — PC Ownership vs. Learning Mode", 'obj2_pc_mode', plot_pc_vs_learning_mode, cube, view_key, f"""
 💡 **Interpretation:**  
-Students with a personal computer achieve higher average CGPAs across all learning modes, highlighting the role of digital resource accessibility in academic success.
-""")
+{pc_text} The grouped bars show whether this holds within each learning mode.
+""", drilldown=view)
+
+end_rerun()
@@ -1,56 +1,53 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
+
+from dashboard.compare import render_comparison
+from dashboard.data import comparison_view, load_data, sidebar_view
+from dashboard.figures import figure_section
+from dashboard.instrument import begin_rerun, end_rerun
+from dashboard.plots import (
+    plot_cgpa_by_probation_consultancy, plot_english_probation_heatmap, plot_skill_dev_by_semester
+)
+from dashboard.rates import cube_rate_table, format_rate
+from dashboard.stats import RECORDED_VALUES_NOTE, compare_flag, describe_difference, describe_extremes
+from dashboard.warmup import start_warmup
 
 # --- Streamlit Page Config ---
 st.set_page_config(page_title="Objective 3: Academic Challenges and Student Engagement", layout="wide")
+begin_rerun("Objective 3")
+start_warmup()
 
 # --- Load Data ---
-@st.cache_data
-def load_data():
-    try:
-        # Load from GitHub (ensure the URL is correct)
-        URL = "https://raw.githubusercontent.com/Wanioooo/assignmentSV1/refs/heads/main/new_dataset_academic_performance%20(1).csv"
-        df = pd.read_csv(URL)
-
-        # Ensure categories are ordered
-        df['Age_Group'] = pd.Categorical(df['Age_Group'], categories=['18-20','21-22','23-24','25+'], ordered=True)
-        english_order = ['Basic', 'Intermediate', 'Advance']
-        df['English_Proficiency'] = pd.Categorical(df['English_Proficiency'], categories=english_order, ordered=True)
-
-        return df
-    except Exception as e:
-        st.error(f"🚨 An unexpected error occurred during data loading: {e}")
-        return pd.DataFrame({
-            'Current_CGPA': [], 'Fell_Probation': [], 'Attends_Consultancy': [],
-            'Semester': [], 'Daily_Skill_Dev_Hours': [], 'English_Proficiency': []
-        })
-
 df = load_data()
 
+# --- Global Filters ---
+if not df.empty and 'Current_CGPA' in df.columns:
+    view = sidebar_view()
+    df, cube, view_key = view.frame, view.cube, view.key
+
 # --- Page Title ---
 st.title("Objective 3: Academic Challenges and Student Engagement")
 st.markdown("🤝 Explore the interplay of academic challenges and student engagement with overall performance.")
 
+# --- Dataset Comparison ---
+if not df.empty and 'Current_CGPA' in df.columns:
+    compare = comparison_view()
+    if compare is not None:
+        render_comparison(view, compare)
+
+# --- Test Summaries (set by the statistical tests below the key metrics) ---
+consultancy_text = probation_text = english_text = skill_text = "Not available for the current data."
+
 # --- Summary Box (before visualization) ---
 st.header("Summary Overview", divider="green")
-with st.container(border=True):
-    st.markdown("""
-    **Summary:**  
-    This objective evaluates the role of **support mechanisms** (teacher consultancy), **language proficiency**, and **long-term engagement** (skill development) on academic outcomes.  
-    The metrics reveal a positive **CGPA boost** (approximately +0.13) for students attending **teacher consultancy**, suggesting it is an effective intervention tool.  
-    The box plot confirms that consultation significantly reduces the probability of a student falling into probation.  
-    Critically, the heatmap demonstrates a strong inverse relationship between **English Proficiency** and the **Probation Rate**, with students at the Basic level being the most vulnerable.  
-    Furthermore, students maintain a consistent, stable commitment to **Daily Skill Development** across all semesters, indicating a healthy level of self-directed learning effort over time.
-    """)
+# Filled in once the significance tests have run, so the metrics show without
+# waiting for them.
+summary_box = st.container(border=True)
 
 st.divider()
 
 # --- Validate Data ---
 if df.empty or 'Current_CGPA' not in df.columns:
-    st.warning("⚠️ Cannot run analysis: Data is either empty or failed to load correctly.")
+    st.warning("⚠️ Cannot run analysis: Data failed to load correctly or no students match the current filters.")
 else:
     # --- Key Metrics Section ---
     st.header("Key Support and Skill Metrics", divider="green")
@@ -58,17 +55,17 @@ else:
     col_p, col_c, col_s = st.columns(3)
 
     # Probation Rate
-    probation_rate = (df['Fell_Probation'].astype(str).str.lower() == 'yes').mean() * 100
+    probation = cube_rate_table(cube, [], 'Fell_Probation').iloc[0]
     col_p.metric(
         "Overall Probation Rate",
-        f"{probation_rate:.1f}%",
-        help="Percentage of students who have reported falling on academic probation."
+        f"{probation['rate'] * 100:.1f}%",
+        help=f"Percentage of students who have reported falling on academic probation: {format_rate(probation)}."
     )
 
     # Consultancy CGPA Impact
-    consultancy_cgpa = df.groupby('Attends_Consultancy')['Current_CGPA'].mean()
-    consultancy_yes = consultancy_cgpa.get('Yes', 0)
-    consultancy_no = consultancy_cgpa.get('No', 0)
+    consultancy_cgpa = cube.mean(['Attends_Consultancy'], 'Current_CGPA')
+    consultancy_yes = consultancy_cgpa.get(True, 0)
+    consultancy_no = consultancy_cgpa.get(False, 0)
     cgpa_diff = consultancy_yes - consultancy_no
     col_c.metric(
         "Consultancy CGPA Boost",
@@ -79,7 +76,7 @@ else:
     )
 
     # Skill Development Hours
-    avg_skill_dev = df['Daily_Skill_Dev_Hours'].mean()
+    avg_skill_dev = cube.overall('Daily_Skill_Dev_Hours')['mean']
     col_s.metric(
         "Avg. Daily Skill Dev. Hours",
         f"{avg_skill_dev:.1f} hrs",
@@ -88,78 +85,71 @@ else:
 
     # English Proficiency & Probation
     st.subheader("English Proficiency & Probation")
-    english_prob_rates = df.groupby('English_Proficiency')['Fell_Probation'].apply(
-        lambda x: (x.astype(str).str.lower() == 'yes').mean()) * 100
+    english_prob_rates = cube_rate_table(cube, ['English_Proficiency'], 'Fell_Probation')
     col_basic, col_inter, col_adv = st.columns(3)
-    col_basic.info(f"**Basic English Probation Rate:** {english_prob_rates.get('Basic', 0):.1f}%")
-    col_inter.info(f"**Intermediate English Probation Rate:** {english_prob_rates.get('Intermediate', 0):.1f}%")
-    col_adv.info(f"**Advanced English Probation Rate:** {english_prob_rates.get('Advance', 0):.1f}%")
+    for col, level, label in [(col_basic, 'Basic', 'Basic'), (col_inter, 'Intermediate', 'Intermediate'), (col_adv, 'Advance', 'Advanced')]:
+        text = format_rate(english_prob_rates.loc[level]) if level in english_prob_rates.index else "n/a"
+        col.info(f"**{label} English Probation Rate:** {text}")
 
     st.divider()
 
-    # --- Visualization 1 ---
-    st.subheader("Visualization 1: Grouped Box Plot of CGPA — Probation Status and Teacher Consultancy")
-    fig1 = px.box(
-        df,
-        x='Fell_Probation',
-        y='Current_CGPA',
-        color='Attends_Consultancy',
-        title='CGPA Distribution by Probation Status and Consultancy Attendance',
-        labels={'Fell_Probation':'Did you ever fall in probation?', 'Attends_Consultancy':'Attends Consultancy?'},
-        height=500,
-        range_y=[2.0, 4.0],
-        color_discrete_map={'Yes':'lightsalmon', 'No':'skyblue'}
+    # --- Statistical Tests ---
+    consultancy_test = compare_flag(view_key, df, 'Attends_Consultancy')
+    consultancy_text = describe_difference(consultancy_test, "Students attending teacher consultancy", "those who don't")
+
+    probation_test = compare_flag(view_key, df, 'Attends_Consultancy', metric='Fell_Probation')
+    consultancy_rates = cube_rate_table(cube, ['Attends_Consultancy'], 'Fell_Probation')
+    if probation_test is not None and {True, False} <= set(consultancy_rates.index):
+        verdict = "a statistically significant" if probation_test['significant'] else "not a statistically significant"
+        probation_text = (
+            f"Probation rate is {format_rate(consultancy_rates.loc[True])} with consultancy vs. "
+            f"{format_rate(consultancy_rates.loc[False])} without ({verdict} difference)."
+        )
+
+    english_rates = cube_rate_table(cube, ['English_Proficiency'], 'Fell_Probation')
+    if not english_rates.empty:
+        worst = english_rates['rate'].idxmax()
+        english_text = (
+            f"The probation rate is highest at the **{worst}** proficiency level "
+            f"({format_rate(english_rates.loc[worst])})."
+        )
+        if worst == english_rates.index[0]:
+            english_text += " Language comprehension barriers may affect academic success at lower proficiency levels."
+
+    skill_text = describe_extremes(cube.mean(['Semester'], 'Daily_Skill_Dev_Hours'), "semester",
+                                   metric="daily skill development", unit=" hrs")
+
+    # --- Visualizations (each built only while expanded) ---
+    figure_section(
+        "Visualization 1: Grouped Box Plot of CGPA — Probation Status and Teacher Consultancy", 'obj3_probation',
+        plot_cgpa_by_probation_consultancy, df, view_key,
+        f"**Interpretation:** {consultancy_text} {probation_text}", caption=True
     )
-    st.plotly_chart(fig1, use_container_width=True)
-    st.caption("**Interpretation:** Students who attend consultancy sessions maintain a higher CGPA and show fewer probation cases, confirming consultancy’s positive academic impact.")
-
-    # --- Visualization 2 ---
-    st.subheader("Visualization 2: Line Plot of Average Daily Skill Development Hours by Current Semester")
-    skill_dev_data = df.groupby('Semester')['Daily_Skill_Dev_Hours'].mean().reset_index()
-    fig2 = px.line(
-        skill_dev_data,
-        x='Semester',
-        y='Daily_Skill_Dev_Hours',
-        title='Average Daily Skill Development Hours by Current Semester',
-        markers=True,
-        height=500
+    figure_section(
+        "Visualization 2: Line Plot of Average Daily Skill Development Hours by Current Semester", 'obj3_skill_dev',
+        plot_skill_dev_by_semester, cube, view_key,
+        f"**Interpretation:** {skill_text}",
+        caption=True
     )
-    st.plotly_chart(fig2, use_container_width=True)
-    st.caption("**Interpretation:** Students show consistent engagement in skill development activities across semesters, indicating steady motivation for continuous learning.")
-
-    # --- Visualization 3 ---
-    st.subheader("Visualization 3: Heatmap of Student Count by English Proficiency and Probation Status")
-    count_data = df.groupby(['English_Proficiency','Fell_Probation']).size().unstack(fill_value=0)
-    english_order = ['Basic','Intermediate','Advance']
-    count_data = count_data.reindex(index=english_order)
-
-    fig3 = go.Figure(data=go.Heatmap(
-        z=count_data.values,
-        x=count_data.columns,
-        y=count_data.index,
-        colorscale='Reds',
-        hoverongaps=False
-    ))
-
-    # Add annotation counts
-    annotations = []
-    for i, row in enumerate(count_data.index):
-        for j, col in enumerate(count_data.columns):
-            annotations.append(dict(
-                x=col, y=row,
-                text=str(count_data.iloc[i, j]),
-                showarrow=False,
-                font=dict(color="black")
-            ))
-    fig3.update_layout(
-        title='Student Count by English Proficiency and Probation Status',
-        xaxis_title='Did you ever fall in probation?',
-        yaxis_title='English Language Proficiency',
-        annotations=annotations,
-        height=500
+    figure_section(
+        "Visualization 3: Heatmap of Student Count by English Proficiency and Probation Status", 'obj3_english',
+        plot_english_probation_heatmap, cube, view_key,
+        f"**Interpretation:** {english_text}",
+        caption=True, drilldown=view
     )
-    fig3.update_coloraxes(colorbar_title='Count of Students')
-    st.plotly_chart(fig3, use_container_width=True)
-    st.caption("**Interpretation:** Students with basic English proficiency are more likely to fall on probation, suggesting language comprehension barriers significantly affect academic success.")
 
     st.divider()
+
+# --- Summary Box ---
+with summary_box:
+    st.markdown(f"""
+    **Summary:**  
+    This objective evaluates the role of **support mechanisms** (teacher consultancy), **language proficiency**, and **long-term engagement** (skill development) on academic outcomes.  
+    **Teacher consultancy and CGPA:** {consultancy_text}  
+    **Teacher consultancy and probation:** {probation_text}  
+    **English Proficiency:** {english_text}  
+    **Daily Skill Development:** {skill_text}  
+    _{RECORDED_VALUES_NOTE}_
+    """)
+
+end_rerun()
@@ -0,0 +1,99 @@
+import streamlit as st
+
+from dashboard.data import load_data, sidebar_view
+from dashboard.figures import figure_section
+from dashboard.importance import FACTOR_TARGETS, factor_ranking
+from dashboard.instrument import begin_rerun, end_rerun
+from dashboard.plots import plot_factor_correlations, plot_factor_importance
+from dashboard.warmup import start_warmup
+
+# =========================================================
+# Academic Performance Visualization Dashboard
+# Factor Ranking: every column against CGPA and probation
+# =========================================================
+
+st.set_page_config(
+    page_title="Factor Ranking",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+begin_rerun("Factor Ranking")
+start_warmup()
+
+# =========================================================
+# Load Dataset
+# =========================================================
+df = load_data()
+
+if df.empty or not set(FACTOR_TARGETS) <= set(df.columns):
+    st.warning("Dataset could not be loaded or is missing required columns.")
+    end_rerun()
+    st.stop()
+
+# =========================================================
+# Global Filters
+# =========================================================
+view = sidebar_view()
+df, view_key = view.frame, view.key
+
+if len(df) < 10:
+    st.warning("Too few students match the current filters to rank factors.")
+    end_rerun()
+    st.stop()
+
+# =========================================================
+# Page Description
+# =========================================================
+st.header("Factor Ranking: What Goes Along with CGPA and Probation?")
+st.markdown(
+    "🔎 **Goal:** Rank every recorded factor by its association with **Current CGPA** and "
+    "**falling into probation**, beyond the hand-picked factors of the three objectives."
+)
+
+ranking = factor_ranking(view_key, df)
+labels = {'Current_CGPA': "Current CGPA", 'Fell_Probation': "Probation"}
+
+# =========================================================
+# Key Metrics
+# =========================================================
+st.header("Strongest Factors", divider="blue")
+
+columns = st.columns(len(ranking['rankings']))
+for col, (target, table) in zip(columns, ranking['rankings'].items()):
+    top = table.index[0]
+    col.metric(f"Top factor for {labels[target]}", top.replace('_', ' '),
+               f"R² lost when shuffled: {table['permutation'].iloc[0]:.3f}", delta_color="off")
+
+st.markdown("""
+* **Correlation** is Pearson's r for numeric, yes/no and ordered factors, and the correlation ratio (η, 0 to 1) for
+  categorical ones.
+* **Mutual information** (nats) also picks up non-linear relationships; every factor is cut into at most 16 levels.
+* **Permutation importance** is the held-out R² a ridge model loses when the factor is shuffled, so factors that only
+  repeat what another factor already says rank low.
+Numeric values are clipped to their 1st–99th percentiles first, so a few data-entry outliers do not dominate.
+""")
+
+st.divider()
+
+# =========================================================
+# Visualizations + Tables
+# =========================================================
+# Each section is only built while it is expanded.
+for target in ranking['rankings']:
+    figure_section(f"Permutation Importance: {labels[target]}", f"rank_{target}", plot_factor_importance,
+                   ranking, view_key, params={'target': target})
+
+figure_section("Correlation Matrix of Numeric Factors", 'rank_correlations', plot_factor_correlations,
+               ranking, view_key,
+               "**Interpretation:** Strongly correlated factors share their importance in the model; "
+               "read their permutation scores together.", caption=True)
+
+with st.expander("Full ranking tables"):
+    tabs = st.tabs([labels[target] for target in ranking['rankings']])
+    for tab, table in zip(tabs, ranking['rankings'].values()):
+        tab.dataframe(table, use_container_width=True, column_config={
+            name: st.column_config.NumberColumn(format="%.4f")
+            for name in ['correlation', 'mutual_info', 'permutation']
+        })
+
+end_rerun()
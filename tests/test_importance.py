@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import importance
+from dashboard.importance import rank_factors
+
+
+@pytest.fixture
+def students():
+    rng = np.random.default_rng(0)
+    n = 2000
+    study = rng.uniform(0, 6, n)
+    program = rng.choice(['BBA', 'CSE', 'EEE', 'LAW'], n)
+    cgpa = 2.5 + 0.2 * study + np.where(program == 'CSE', 0.3, 0) + rng.normal(0, 0.2, n)
+    return pd.DataFrame({
+        'Study_Hours': study,
+        'Attendance_Pct': rng.uniform(40, 100, n),
+        'Program': pd.Categorical(program),
+        'Gender': pd.Categorical(rng.choice(['Female', 'Male'], n)),
+        'Current_CGPA': cgpa,
+        'Fell_Probation': cgpa < 2.9,
+    })
+
+
+def test_parallel_scoring_matches_serial(students, monkeypatch):
+    pools = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs['max_workers'])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(importance, 'PARALLEL_MIN_ELEMENTS', 0)
+    monkeypatch.setattr(importance, 'ProcessPoolExecutor', RecordingPool)
+    serial = rank_factors(students, workers=1)
+    parallel = rank_factors(students, workers=2)
+
+    assert pools == [2]
+    for target, table in serial['rankings'].items():
+        pd.testing.assert_frame_equal(parallel['rankings'][target], table)
+
+
+def test_small_frames_are_scored_in_process(students, monkeypatch):
+    monkeypatch.setattr(importance, 'ProcessPoolExecutor', None)
+    ranking = rank_factors(students, workers=4)['rankings']['Current_CGPA']
+    assert ranking.index[0] == 'Study_Hours'
+    assert ranking.loc['Program', 'correlation'] > ranking.loc['Gender', 'correlation']
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.aggregates import AggregateCube
+from dashboard.rates import cube_rate_table, rate_table, rate_tables
+
+
+@pytest.fixture
+def students():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'Program': pd.Categorical(rng.choice(['BBA', 'CSE', 'EEE'], n)),
+        'Gender': pd.Categorical(rng.choice(['Female', 'Male'], n)),
+        'Fell_Probation': rng.random(n) < 0.3,
+        'Got_Suspension': rng.random(n) < 0.1,
+    })
+
+
+def test_rate_table_matches_groupby_mean(students):
+    table = rate_table(students, ['Program'], 'Fell_Probation')
+    expected = students.groupby('Program', observed=True)['Fell_Probation'].mean()
+    np.testing.assert_allclose(table['rate'], expected)
+    assert (table['ci_low'] <= table['rate']).all() and (table['rate'] <= table['ci_high']).all()
+
+
+def test_rate_tables_share_one_groupby(students):
+    tables = rate_tables(students, ['Gender'], flags=['Fell_Probation', 'Got_Suspension', 'Missing'])
+    assert set(tables) == {'Fell_Probation', 'Got_Suspension'}
+    pd.testing.assert_frame_equal(tables['Got_Suspension'], rate_table(students, ['Gender'], 'Got_Suspension'))
+
+
+def test_cube_rate_table_falls_back_to_rows_for_uncovered_keys(students):
+    cube = AggregateCube.build(students)
+    assert not cube.covers(['Program'], 'Fell_Probation')
+    with pytest.raises(KeyError):
+        cube_rate_table(cube, ['Program'], 'Fell_Probation')
+
+    table = cube_rate_table(cube, ['Program'], 'Fell_Probation', df=students)
+    pd.testing.assert_frame_equal(table, rate_table(students, ['Program'], 'Fell_Probation'))
+
+
+def test_cube_rate_table_uses_the_cube_for_covered_keys(students):
+    cube = AggregateCube.build(students)
+    assert cube.covers(['Gender'], 'Fell_Probation')
+    table = cube_rate_table(cube, ['Gender'], 'Fell_Probation', df=students)
+    np.testing.assert_allclose(table['rate'], rate_table(students, ['Gender'], 'Fell_Probation')['rate'])
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from dashboard import data
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    target = tmp_path / 'snapshots'
+    monkeypatch.setattr(data, 'SNAPSHOT_DIR', target)
+    return target
+
+
+@pytest.fixture
+def lines():
+    return Path(data.DATA_PATH).read_text().splitlines()
+
+
+def ingest(path):
+    return data.ingest_snapshot(path, data.file_fingerprint(path))
+
+
+def snapshots(path):
+    return [target.name for target, _ in data.source_snapshots(path)]
+
+
+def test_only_the_current_snapshot_is_kept(tmp_path, snapshot_dir, lines):
+    campus, other = tmp_path / 'campus.csv', tmp_path / 'campus-fall.csv'
+    campus.write_text('\n'.join(lines[:301]) + '\n')
+    other.write_text('\n'.join(lines[:101]) + '\n')
+    ingest(campus)
+    ingest(other)
+
+    # Appended rows: the new snapshot is built on the old one, which is removed.
+    with open(campus, 'a') as fh:
+        fh.write('\n'.join(lines[301:401]) + '\n')
+    assert len(ingest(campus)) == 400
+    assert snapshots(campus) == [data.snapshot_path(campus).name]
+
+    # Rewritten file: a full re-ingest also prunes the earlier snapshot.
+    campus.write_text('\n'.join(lines[:1] + lines[201:]) + '\n')
+    assert len(ingest(campus)) == len(lines) - 201
+    assert snapshots(campus) == [data.snapshot_path(campus).name]
+    assert snapshots(other) == [data.snapshot_path(other).name]
+    assert len(list(snapshot_dir.glob('*.feather'))) == 2